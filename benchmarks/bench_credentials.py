@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Credential backend benchmark
+Times importing and exporting the passwords of a synthetic roster, one
+item at a time as AccountManager used to (each write preceded by a read
+of the simple-name credential, each read its own call) against the bulk
+write_many / read_many calls. Every backend call is counted as a round
+trip, and --latency adds a simulated per-call delay to the in-process
+backends. On Windows --windows also runs the real Credential Manager
+under a separate service name and deletes its entries afterwards.
+
+Usage: python benchmarks/bench_credentials.py [--accounts 500] [--latency 0.0002]
+           [--backends memory,file] [--windows]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import corpus_tools  # noqa: F401  (puts src on sys.path)
+
+from leagueaccounts.credential_backends import (CredentialBackend, MemoryCredentialBackend,
+                                                FileCredentialBackend, WindowsCredentialBackend)
+
+SERVICE = 'LeagueAccountsBench'
+
+
+class RoundTrips(CredentialBackend):
+    """Counts calls into a backend, each taking at least latency seconds."""
+
+    def __init__(self, backend, latency):
+        self.backend = backend
+        self.name = backend.name
+        self.latency = latency
+        self.calls = 0
+
+    def _call(self, method, *args):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return getattr(self.backend, method)(*args)
+
+    def get_password(self, service, username):
+        return self._call('get_password', service, username)
+
+    def set_password(self, service, username, password):
+        return self._call('set_password', service, username, password)
+
+    def delete_password(self, service, username):
+        return self._call('delete_password', service, username)
+
+    def enumerate(self, service):
+        return self._call('enumerate', service)
+
+    def read_many(self, service, usernames):
+        return self._call('read_many', service, usernames)
+
+    def write_many(self, service, passwords):
+        return self._call('write_many', service, passwords)
+
+
+def legacy_import(backend, passwords):
+    for username, password in passwords.items():
+        backend.get_password(SERVICE, SERVICE)   # the simple-name check before every write
+        backend.set_password(SERVICE, username, password)
+
+
+def legacy_export(backend, usernames):
+    return {username: backend.get_password(SERVICE, username) for username in usernames}
+
+
+def run(make_backend, passwords, label):
+    usernames = list(passwords)
+    rows = []
+    for mode, do_import, do_export in (
+            ('per item', lambda b: legacy_import(b, passwords), lambda b: legacy_export(b, usernames)),
+            ('bulk', lambda b: b.write_many(SERVICE, passwords), lambda b: b.read_many(SERVICE, usernames))):
+        backend = make_backend()
+        calls = getattr(backend, 'calls', None)
+        start = time.perf_counter()
+        do_import(backend)
+        import_ms = (time.perf_counter() - start) * 1000
+        import_calls = backend.calls - calls if calls is not None else None
+        calls = getattr(backend, 'calls', None)
+        start = time.perf_counter()
+        found = do_export(backend)
+        export_ms = (time.perf_counter() - start) * 1000
+        export_calls = backend.calls - calls if calls is not None else None
+        missing = sum(1 for u in usernames if found.get(u) != passwords[u])
+        rows.append((label, mode, import_ms, import_calls, export_ms, export_calls, missing))
+        for username in usernames:
+            backend.delete_password(SERVICE, username)
+        backend.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--accounts', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.0002,
+                        help='simulated seconds per call for the in-process backends')
+    parser.add_argument('--backends', default='memory,file')
+    parser.add_argument('--windows', action='store_true', help='also run the Windows Credential Manager')
+    args = parser.parse_args()
+
+    passwords = {f'euw:bench{i}': f'password-{i}' for i in range(args.accounts)}
+    directory = tempfile.mkdtemp(prefix='bench-credentials-')
+    factories = {
+        'memory': lambda: RoundTrips(MemoryCredentialBackend(), args.latency),
+        'file': lambda: RoundTrips(FileCredentialBackend(os.path.join(directory, 'credentials.json')),
+                                   args.latency),
+    }
+    rows = []
+    try:
+        for name in args.backends.split(','):
+            rows.extend(run(factories[name], passwords, name))
+        if args.windows:
+            if sys.platform != 'win32':
+                parser.error('--windows needs Windows')
+            rows.extend(run(WindowsCredentialBackend, passwords, 'windows'))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"Credential backend benchmark, {args.accounts} accounts, {args.latency * 1000:.2f} ms per call")
+    print("=" * 78)
+    print(f"{'backend':<10}{'mode':<10}{'import':>12}{'calls':>8}{'export':>12}{'calls':>8}{'wrong':>8}")
+    for label, mode, import_ms, import_calls, export_ms, export_calls, missing in rows:
+        print(f"{label:<10}{mode:<10}{import_ms:>9.1f} ms{import_calls if import_calls is not None else '-':>8}"
+              f"{export_ms:>9.1f} ms{export_calls if export_calls is not None else '-':>8}{missing:>8}")
+    if any(row[-1] for row in rows):
+        print("WARNING: some passwords did not read back")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Parse pipeline benchmark
+Compares a thread-only refresh pipeline (fetch threads parse in-process)
+with the split pipeline (fetch threads hand page bytes to a parser
+process pool) on recorded pages. Network I/O is simulated with a sleep.
+
+Usage: python benchmarks/bench_parse_pipeline.py [--pages N] [--threads N]
+           [--workers N] [--io-latency SECONDS] [--backend NAME] [corpus ...]
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from leagueaccounts.extractors import get_extractor, DEFAULT_EXTRACTOR, EXTRACTORS
+from leagueaccounts.parse_pool import ParsePool, extract_rank_info, default_workers
+
+DEFAULT_CORPUS = ROOT / "benchmarks" / "corpus"
+
+
+def load_pages(paths):
+    pages = []
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.rglob('*.html')) if path.is_dir() else [path]
+        pages.extend(f.read_bytes() for f in files if f.exists())
+    return pages
+
+
+def run_thread_only(pages, threads, io_latency, backend):
+    extractor = get_extractor(backend)
+
+    def job(page):
+        time.sleep(io_latency)
+        return extractor.extract(page.decode('utf-8', errors='replace'))
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(job, pages))
+
+
+def run_split(pages, threads, io_latency, backend, parse_pool):
+    def job(page):
+        time.sleep(io_latency)
+        return parse_pool.parse(page, 'utf-8', backend)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(job, pages))
+
+
+def report(name, elapsed, count):
+    print(f"   {name:<12} {elapsed:8.3f}s  {count / elapsed:10.1f} pages/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('corpus', nargs='*', default=[DEFAULT_CORPUS])
+    parser.add_argument('--pages', type=int, default=500, help='pages per run (corpus is repeated)')
+    parser.add_argument('--threads', type=int, default=8, help='fetch threads')
+    parser.add_argument('--workers', type=int, default=default_workers(), help='parser processes')
+    parser.add_argument('--io-latency', type=float, default=0.0, help='simulated network time per page')
+    parser.add_argument('--backend', choices=list(EXTRACTORS), default=DEFAULT_EXTRACTOR)
+    args = parser.parse_args()
+
+    corpus = load_pages(args.corpus)
+    if not corpus:
+        print("ERROR: No recorded pages found")
+        sys.exit(1)
+    pages = [corpus[i % len(corpus)] for i in range(args.pages)]
+
+    print("Parse pipeline benchmark")
+    print("=" * 40)
+    print(f"{len(pages)} pages ({len(corpus)} distinct), backend={args.backend}, "
+          f"threads={args.threads}, workers={args.workers}, io_latency={args.io_latency}s")
+
+    start = time.perf_counter()
+    thread_results = run_thread_only(pages, args.threads, args.io_latency, args.backend)
+    report('thread-only', time.perf_counter() - start, len(pages))
+
+    parse_pool = ParsePool(args.workers)
+    try:
+        # Spawn the workers before timing so start-up cost is not counted
+        parse_pool.parse(corpus[0], 'utf-8', args.backend)
+        start = time.perf_counter()
+        split_results = run_split(pages, args.threads, args.io_latency, args.backend, parse_pool)
+        report('split', time.perf_counter() - start, len(pages))
+    finally:
+        parse_pool.shutdown(wait=True)
+
+    if thread_results != split_results:
+        print("ERROR: Pipelines produced different results")
+        sys.exit(1)
+    # Sanity check that worker-side decoding matches in-process decoding
+    assert extract_rank_info(corpus[0], 'utf-8', args.backend) == thread_results[0]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark suite
+Feeds the recorded-page corpus through every rank extraction backend with
+no network access and reports, per backend:
+  - throughput (pages/sec over the whole corpus)
+  - per-field cost: time for extract(fields=<field>) minus the bare
+    tokenize/DOM cost of extract(fields=()), for backends that look each
+    field up separately (single-pass scanners do the same work whatever
+    is asked for, so they only get the total)
+  - peak Python memory for one pass (tracemalloc)
+and checks every extracted value against the expectations stored in the
+corpus manifest (the last-season fields derived from the expected
+season history). Exits non-zero on any mismatch.
+
+Usage: python benchmarks/bench_parsers.py [--repeat N] [--backend NAME ...] [--json PATH]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from corpus_tools import load_manifest, iter_pages, expected_result
+
+from leagueaccounts.extractors import EXTRACTORS, ALL_FIELDS
+
+FIELD_GROUPS = {
+    'level': ('level',),
+    'lp': ('lp',),
+    'tier/division': ('tier', 'division'),
+    'seasons': ('reached_last_season', 'finished_last_season', 'season_history'),
+}
+# Backends whose cost does not depend on the requested fields
+SINGLE_PASS = {'fast'}
+
+
+def time_pass(extractor, pages, fields, repeat):
+    """Best-of-repeat wall time for one pass over all pages."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _, _, page_text in pages:
+            extractor.extract(page_text, fields)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(extractor, pages):
+    tracemalloc.start()
+    try:
+        for _, _, page_text in pages:
+            extractor.extract(page_text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def check_expectations(name, extractor, pages):
+    mismatches = []
+    for rel_path, entry, page_text in pages:
+        expected = expected_result(entry)
+        if expected is None:
+            continue
+        actual = extractor.extract(page_text)
+        for key, value in expected.items():
+            if actual.get(key) != value:
+                mismatches.append((rel_path, key, value, actual.get(key)))
+    for rel_path, key, value, actual in mismatches:
+        print(f"   MISMATCH [{name}] {rel_path} {key}: expected {value!r}, got {actual!r}")
+    return mismatches
+
+
+def bench_backend(name, pages, repeat):
+    extractor = EXTRACTORS[name]()
+    total = time_pass(extractor, pages, ALL_FIELDS, repeat)
+    baseline = time_pass(extractor, pages, (), repeat)
+    fields = None
+    if name not in SINGLE_PASS:
+        fields = {}
+        for group, group_fields in FIELD_GROUPS.items():
+            elapsed = time_pass(extractor, pages, group_fields, repeat)
+            fields[group] = max(0.0, elapsed - baseline) / len(pages) * 1000
+    return {
+        'pages_per_sec': len(pages) / total,
+        'ms_per_page': total / len(pages) * 1000,
+        'baseline_ms_per_page': baseline / len(pages) * 1000,
+        'field_ms_per_page': fields,
+        'peak_memory_kib': peak_memory(extractor, pages) / 1024,
+        'mismatches': len(check_expectations(name, extractor, pages)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='passes per measurement (best is kept)')
+    parser.add_argument('--backend', action='append', choices=list(EXTRACTORS),
+                        help='backend to benchmark (default: all)')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON')
+    args = parser.parse_args()
+
+    pages = list(iter_pages(load_manifest()))
+    if not pages:
+        print("ERROR: Corpus is empty; record pages with benchmarks/record_pages.py")
+        sys.exit(1)
+
+    print("Parser benchmark")
+    print("=" * 40)
+    print(f"{len(pages)} pages, best of {args.repeat}")
+    results = {}
+    for name in args.backend or list(EXTRACTORS):
+        result = results[name] = bench_backend(name, pages, args.repeat)
+        print(f"\n[{name}]")
+        print(f"   throughput   {result['pages_per_sec']:10.1f} pages/s ({result['ms_per_page']:.3f} ms/page)")
+        print(f"   tokenize/DOM {result['baseline_ms_per_page']:10.3f} ms/page")
+        if result['field_ms_per_page'] is None:
+            print("   per field          n/a (single pass, every field costs the same)")
+        else:
+            for group, ms in result['field_ms_per_page'].items():
+                print(f"   {group:<13}{ms:10.3f} ms/page")
+        print(f"   peak memory  {result['peak_memory_kib']:10.1f} KiB")
+        print(f"   expectations {'OK' if not result['mismatches'] else str(result['mismatches']) + ' MISMATCHES'}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'pages': len(pages), 'repeat': args.repeat, 'backends': results}, f, indent=2)
+
+    sys.exit(1 if any(r['mismatches'] for r in results.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+End-to-end refresh benchmark
+Runs a full refresh of a synthetic roster through FetchService and
+RankFetcher against the local stand-in server, once per concurrency
+setting, and reports wall time, throughput, latency and how failures
+were classified. --phases adds the median time per fetch phase from the
+instrumentation records; --report writes each run's RunReport as JSON.
+--async drives the run through RankFetcher.fetch_many on one event loop
+instead of the FetchService thread pool (concurrency = requests in flight).
+--hedge wraps the fetcher in a HedgedRankSource whose backup is a second
+fetcher for the same site with its own connection pool and the primary's
+circuit breaker; through FetchService backups run in --hedge-reserve extra
+per-host slots that the refresh's fetches cannot take. Use a heavy-tailed
+--latency to see the effect on the service-time p95/p99.
+
+Usage: python benchmarks/bench_refresh.py [--accounts 1000] [--concurrency 1,4,8,16]
+           [--rate 1000] [--async] [--hedge] [--hedge-reserve 1] [--phases] [--report PATH_PREFIX]
+           [stand-in fault options, see standin_server.py]
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from standin_server import add_config_arguments, config_from_args, start_server
+
+from leagueaccounts.fetch_service import FetchService, DEFAULT_HEDGE_RESERVE
+from leagueaccounts.instrumentation import RunReport, PHASES
+from leagueaccounts.models import Account
+from leagueaccounts.rank_fetcher import RankFetcher
+from leagueaccounts.rank_sources import HedgedRankSource
+from leagueaccounts.rate_limiter import RateLimiter
+
+
+def make_roster(count):
+    return [Account(account_id=f'bench{i}', name=f'Bench{i}#LOAD', region='euw', region_display='EUW')
+            for i in range(count)]
+
+
+def run_refresh(base_url, accounts, concurrency, args):
+    rate_limiter = RateLimiter(rate=args.rate, burst=max(1, int(args.rate)))
+    fetcher = RankFetcher(base_url=base_url, pool_maxsize=concurrency, max_retries=args.retries,
+                          rate_limiter=rate_limiter, streaming=args.streaming)
+    if args.hedge:
+        backup = RankFetcher(base_url=base_url, pool_maxsize=concurrency, max_retries=args.retries,
+                             rate_limiter=rate_limiter, streaming=args.streaming, breaker=fetcher.breaker)
+        fetcher = HedgedRankSource(fetcher, backup, max_workers=2 * concurrency)
+    report = RunReport(f'{concurrency} in flight')
+    latencies = []
+    outcomes = Counter()
+    submitted = {}
+
+    def on_done(acc, rank_info):
+        latencies.append(time.perf_counter() - submitted[acc.account_id])
+        outcomes[rank_info.get('error') or 'ok'] += 1
+
+    start = time.perf_counter()
+    for acc in accounts:
+        submitted[acc.account_id] = time.perf_counter()
+    if args.use_async:
+        async def run():
+            try:
+                await fetcher.fetch_many(accounts, callback=on_done, timeout=args.deadline, report=report,
+                                         max_in_flight=concurrency)
+            finally:
+                await fetcher.aclose()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - start
+    else:
+        reserve = args.hedge_reserve if args.hedge else 0
+        service = FetchService(fetcher, max_workers=concurrency, per_host_limit=concurrency + reserve,
+                               hedge_reserve=reserve)
+        if args.hedge:
+            fetcher.hedge_slot = service.hedge_slot
+        try:
+            futures = service.submit_many(accounts, callback=on_done, timeout=args.deadline, report=report)
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - start
+        finally:
+            service.shutdown(wait=True)
+    report.finish()
+    return elapsed, sorted(latencies), outcomes, report, fetcher
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--concurrency', default='1,4,8,16', help='comma-separated worker counts')
+    parser.add_argument('--rate', type=float, default=1000.0, help='rate limiter requests/sec per host')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--deadline', type=float, default=600.0, help='refresh run deadline in seconds')
+    parser.add_argument('--streaming', action='store_true')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='use RankFetcher.fetch_many instead of FetchService')
+    parser.add_argument('--hedge', action='store_true', help='hedge slow requests to a backup fetcher')
+    parser.add_argument('--hedge-reserve', type=int, default=DEFAULT_HEDGE_RESERVE,
+                        help='per-host slots for backup requests on top of --concurrency')
+    parser.add_argument('--phases', action='store_true', help='print median time per fetch phase')
+    parser.add_argument('--report', metavar='PATH_PREFIX', help='write <prefix>_<workers>.json run reports')
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    config = config_from_args(args)
+    if not config.synthetic and not config.pages:
+        config.synthetic = True
+    server, base_url = start_server(config)
+    accounts = make_roster(args.accounts)
+
+    print("End-to-end refresh benchmark")
+    print("=" * 40)
+    print(f"{len(accounts)} accounts against {base_url}")
+    print(f"{'workers':>8} {'wall s':>8} {'acc/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  outcomes")
+    try:
+        for concurrency in (int(c) for c in args.concurrency.split(',')):
+            elapsed, latencies, outcomes, report, fetcher = run_refresh(base_url, accounts, concurrency, args)
+            summary = ', '.join(f'{k}={v}' for k, v in sorted(outcomes.items()))
+            print(f"{concurrency:>8} {elapsed:>8.2f} {len(accounts) / elapsed:>8.1f} "
+                  f"{percentile(latencies, 50) * 1000:>8.0f} {percentile(latencies, 95) * 1000:>8.0f} "
+                  f"{percentile(latencies, 99) * 1000:>8.0f}  {summary}")
+            if args.phases:
+                phases = report.summary()['phases']
+                print(' ' * 9 + '  '.join(f"{name} {phases[name]['p50_ms']:.1f}" for name in PHASES) + '  (p50 ms)')
+            service = report.summary()['service_ms']
+            print(' ' * 9 + f"service time p50 {service['p50']:.0f} ms, p95 {service['p95']:.0f} ms, "
+                            f"p99 {service['p99']:.0f} ms")
+            if args.hedge:
+                print(' ' * 9 + f"hedging {fetcher.stats()}")
+            if args.report:
+                report.write(f'{args.report}_{concurrency}.json')
+    finally:
+        server.shutdown()
+    print(f"\nServer counters: {config.counters}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Account storage benchmark
+Compares the JSON snapshot + journal store with the SQLite store on a
+synthetic roster: initial save, cold load, single-change writes (one
+write-behind flush each), a refresh-sized batch of rank updates, and
+search / rank filter / stale selection starting from nothing in memory.
+The JSON store has to load and scan the roster for every query; the
+SQLite store answers from its indexes. Each run uses a fresh temp dir.
+
+Usage: python benchmarks/bench_storage.py [--accounts 10000] [--updates 200]
+           [--batch 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+import corpus_tools  # noqa: F401  (puts src on sys.path)
+
+from leagueaccounts.account_manager import DEFAULT_MIN_TTL, DEFAULT_MAX_TTL
+from leagueaccounts.persistence import JournaledAccountStore
+from leagueaccounts.sqlite_store import SqliteAccountStore
+from leagueaccounts.utils import TIER_ORDER, rank_sort_key, tier_score_range, rank_score
+
+TIERS = [t for t in TIER_ORDER if t not in ('Unranked', 'Error')]
+NOW = 1_750_000_000.0
+
+
+def make_records(count, seed=1):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        tier = rng.choice(TIERS + ['Unranked'])
+        apex = tier in ('Challenger', 'Grandmaster', 'Master')
+        records.append({
+            'account_id': f'bench{i}', 'name': f'Bench Player {i}#LOAD', 'region': 'euw',
+            'region_display': 'EUW', 'description': rng.choice(['', 'main', 'smurf', 'flex only']),
+            'tier': tier, 'division': '' if apex or tier == 'Unranked' else rng.choice(['I', 'II', 'III', 'IV']),
+            'lp': '' if tier == 'Unranked' else str(rng.randrange(100 if not apex else 1500)),
+            'level': str(rng.randrange(30, 600)),
+            'reached_last_season': 'Gold II', 'finished_last_season': 'Gold IV',
+            'last_fetched': NOW - rng.uniform(0, 3 * 24 * 3600),
+            'last_changed': NOW - rng.uniform(0, 30 * 24 * 3600),
+            'unchanged_fetches': rng.randrange(12),
+            'season_history': {f'Season {y}': ['Gold II', 'Gold IV'] for y in range(2021, 2025)},
+        })
+    return records
+
+
+def rank_change(record, rng):
+    return {'op': 'set', 'key': [record['region'], record['account_id']],
+            'fields': {'lp': str(rng.randrange(100)), 'last_fetched': NOW, 'unchanged_fetches': 0}}
+
+
+class JsonBackend:
+    name = 'json + journal'
+
+    def __init__(self, directory, records):
+        self.store = JournaledAccountStore(os.path.join(directory, 'league_accounts.json'))
+        self.records = records
+
+    def snapshot(self):
+        return self.records
+
+    def files(self):
+        return [self.store.path, self.store.journal_path]
+
+    # Queries have to start from a load, like a cold start of the app
+    def search(self, text):
+        text = text.lower()
+        return [r for r in self.store.load() if text in r['name'].lower() or text in r['account_id'].lower()]
+
+    def by_rank(self, lowest, highest):
+        low, high = tier_score_range(lowest)[0], tier_score_range(highest)[1]
+        found = [r for r in self.store.load() if low <= rank_score(r['tier'], r['division'], r['lp']) <= high]
+        return sorted(found, key=lambda r: rank_sort_key(r['tier'], r['division'], r['lp']))
+
+    def stale(self, now):
+        return [r for r in self.store.load()
+                if now - r['last_fetched'] >= min(DEFAULT_MAX_TTL,
+                                                  DEFAULT_MIN_TTL * 2 ** min(r['unchanged_fetches'], 16))]
+
+
+class SqliteBackend:
+    name = 'sqlite'
+
+    def __init__(self, directory, records):
+        self.store = SqliteAccountStore(os.path.join(directory, 'league_accounts.db'))
+        self.records = records
+
+    def snapshot(self):
+        raise AssertionError('the SQLite store never needs a snapshot')
+
+    def files(self):
+        return [self.store.path, self.store.path + '-wal', self.store.path + '-shm']
+
+    def search(self, text):
+        return self.store.search(text)
+
+    def by_rank(self, lowest, highest):
+        return self.store.by_rank(lowest, highest)
+
+    def stale(self, now):
+        return self.store.stale(now, DEFAULT_MIN_TTL, DEFAULT_MAX_TTL)
+
+
+def timed(fn, repeat=1):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def run_backend(backend_cls, records, args):
+    directory = tempfile.mkdtemp(prefix='bench-storage-')
+    rng = random.Random(7)
+    rows = {}
+    try:
+        backend = backend_cls(directory, records)
+        store = backend.store
+        rows['initial save'], _ = timed(lambda: store.save(records))
+        rows['cold load'], loaded = timed(store.load, args.repeat)
+        assert len(loaded) == len(records), (len(loaded), len(records))
+
+        single = []
+        for _ in range(args.updates):
+            change = rank_change(rng.choice(records), rng)
+            elapsed, _ = timed(lambda: store.write([change], backend.snapshot))
+            single.append(elapsed)
+        rows['single-change write (median)'] = statistics.median(single)
+        rows['single-change write (max)'] = max(single)
+
+        batch = [rank_change(r, rng) for r in rng.sample(records, min(args.batch, len(records)))]
+        rows[f'batch of {len(batch)} changes'], _ = timed(lambda: store.write(batch, backend.snapshot))
+        rows['load after writes'], loaded = timed(store.load, args.repeat)
+        assert len(loaded) == len(records)
+
+        rows['search "player 123"'], found = timed(lambda: backend.search('player 123'), args.repeat)
+        counts = {'search': len(found)}
+        rows['rank filter Gold..Diamond'], found = timed(lambda: backend.by_rank('Gold', 'Diamond'), args.repeat)
+        counts['rank'] = len(found)
+        rows['stale selection'], found = timed(lambda: backend.stale(NOW), args.repeat)
+        counts['stale'] = len(found)
+        size = sum(os.path.getsize(p) for p in backend.files() if os.path.exists(p))
+        store.close()
+        return rows, counts, size
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--accounts', type=int, default=10000)
+    parser.add_argument('--updates', type=int, default=200, help='single-change writes to time')
+    parser.add_argument('--batch', type=int, default=1000, help='changes in the batched write')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per read measurement (median)')
+    args = parser.parse_args()
+
+    records = make_records(args.accounts)
+    print(f"Account storage benchmark, {args.accounts} accounts")
+    print("=" * 72)
+    results = [(cls.name, *run_backend(cls, records, args)) for cls in (JsonBackend, SqliteBackend)]
+
+    print(f"{'':<32}" + ''.join(f"{name:>20}" for name, _, _, _ in results))
+    for label in results[0][1]:
+        print(f"{label:<32}" + ''.join(f"{rows[label]:>17.2f} ms" for _, rows, _, _ in results))
+    print(f"{'on disk':<32}" + ''.join(f"{size / 1024:>17.0f} KB" for _, _, _, size in results))
+    for name, _, counts, _ in results:
+        print(f"{name}: {counts}")
+    if len({tuple(sorted(c.items())) for _, _, c, _ in results}) != 1:
+        print("WARNING: backends returned different query results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Extractor parity check
+Runs every rank extraction backend over the recorded-page corpus and
+reports any page where a backend disagrees with the bs4 reference.
+Backends with a streaming scanner are also fed each page in chunks, the
+way RankFetcher streams a response (stopping as soon as done() says every
+requested field is known), for both a full and a current-rank-only fetch.
+
+Usage: python benchmarks/check_parity.py
+"""
+
+import codecs
+import sys
+
+from corpus_tools import CORPUS_DIR, REFERENCE_BACKEND as REFERENCE, load_manifest, iter_pages
+
+from leagueaccounts.extractors import EXTRACTORS, ALL_FIELDS, CURRENT_FIELDS
+from leagueaccounts.rank_fetcher import STREAM_CHUNK_SIZE
+
+# Chunk sizes to stream with: the fetcher's own, and a small one to put
+# chunk boundaries inside tags, attributes and text
+CHUNK_SIZES = (STREAM_CHUNK_SIZE, 256)
+
+
+def stream_extract(backend, raw, encoding, fields, chunk_size):
+    """Feed raw page bytes to a backend's scanner in chunks, as a streamed fetch does."""
+    scanner = backend.scanner(fields)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for start in range(0, len(raw), chunk_size):
+        scanner.feed(decoder.decode(raw[start:start + chunk_size]))
+        if scanner.done():
+            break
+    else:
+        scanner.feed(decoder.decode(b'', final=True))
+        scanner.close()
+    return scanner.result()
+
+
+def check_page(rel_path, entry, html_text):
+    """Return a list of (backend, reference_result, backend_result) mismatches."""
+    reference = EXTRACTORS[REFERENCE]().extract(html_text)
+    mismatches = []
+    for name, backend_cls in EXTRACTORS.items():
+        if name == REFERENCE:
+            continue
+        backend = backend_cls()
+        result = backend.extract(html_text)
+        if result != reference:
+            mismatches.append((name, reference, result))
+        if not hasattr(backend, 'scanner'):
+            continue
+        raw = (CORPUS_DIR / rel_path).read_bytes()
+        for fields in (ALL_FIELDS, CURRENT_FIELDS):
+            expected = {key: reference[key] for key in fields}
+            for chunk_size in CHUNK_SIZES:
+                result = stream_extract(backend, raw, entry.get('encoding') or 'utf-8', fields, chunk_size)
+                if result != expected:
+                    label = f'{name} streamed {chunk_size}B{"" if fields == ALL_FIELDS else " current"}'
+                    mismatches.append((label, expected, result))
+    return mismatches
+
+
+def main():
+    pages = list(iter_pages(load_manifest()))
+    if not pages:
+        print("ERROR: Corpus is empty; record pages with benchmarks/record_pages.py")
+        sys.exit(1)
+
+    failures = 0
+    for rel_path, entry, html_text in pages:
+        mismatches = check_page(rel_path, entry, html_text)
+        if not mismatches:
+            print(f"   OK {rel_path}")
+            continue
+        failures += 1
+        for name, expected, actual in mismatches:
+            print(f"   MISMATCH {rel_path} [{name}]")
+            for key in expected:
+                if expected[key] != actual.get(key):
+                    print(f"      {key}: {REFERENCE}={expected[key]!r} {name}={actual.get(key)!r}")
+
+    print(f"\n{len(pages) - failures}/{len(pages)} pages identical across backends")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
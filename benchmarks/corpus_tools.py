@@ -0,0 +1,59 @@
+"""
+Helpers for the recorded-page fixture corpus under benchmarks/corpus.
+
+manifest.json lists every page with where it came from and the rank info
+the reference (bs4) extractor produced when it was recorded. Bump
+CORPUS_VERSION whenever the manifest layout or the expected-result shape
+changes, then re-run record_pages.py --update-expected.
+
+The last-season fields depend on the current year, so they are not
+stored: expected_result derives them from the expected season_history.
+"""
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+CORPUS_DIR = ROOT / "benchmarks" / "corpus"
+MANIFEST_PATH = CORPUS_DIR / "manifest.json"
+CORPUS_VERSION = 3
+REFERENCE_BACKEND = 'bs4'
+# Expected fields that follow the clock rather than the page
+CLOCK_FIELDS = ('reached_last_season', 'finished_last_season')
+
+
+def load_manifest(check_version=True):
+    if not MANIFEST_PATH.exists():
+        return {'version': CORPUS_VERSION, 'pages': {}}
+    with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if check_version and manifest.get('version') != CORPUS_VERSION:
+        raise SystemExit(f"ERROR: corpus manifest is version {manifest.get('version')}, "
+                         f"expected {CORPUS_VERSION}; re-record or run record_pages.py --update-expected")
+    return manifest
+
+
+def save_manifest(manifest):
+    manifest['version'] = CORPUS_VERSION
+    manifest['pages'] = dict(sorted(manifest['pages'].items()))
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+
+
+def iter_pages(manifest):
+    """Yield (relative_path, entry, page_text) for every page in the manifest."""
+    for rel_path, entry in manifest['pages'].items():
+        raw = (CORPUS_DIR / rel_path).read_bytes()
+        yield rel_path, entry, raw.decode(entry.get('encoding') or 'utf-8', errors='replace')
+
+
+def expected_result(entry):
+    """A page's expected rank info for today, or None if it has no expectation."""
+    expected = entry.get('expected')
+    if expected is None or 'season_history' not in expected:
+        return expected
+    from leagueaccounts.extractors import last_season
+    return {**expected, **dict(zip(CLOCK_FIELDS, last_season(expected['season_history'])))}
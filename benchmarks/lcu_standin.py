@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Local League client (LCU) stand-in
+Imitates the client's local API endpoints used by LcuRankSource
+(/lol-summoner/v1/current-summoner, /lol-ranked/v1/current-ranked-stats,
+/riotclient/region-locale) behind basic auth, and writes a matching
+lockfile so the source can find it.
+
+    python benchmarks/lcu_standin.py --serve   keep serving until Ctrl+C
+                                               (set LEAGUE_LOCKFILE to the printed path)
+    python benchmarks/lcu_standin.py --check   run LcuRankSource against it and verify
+                                               results and scraper fallbacks; exits non-zero
+                                               on failure
+
+Usage: python benchmarks/lcu_standin.py [--serve | --check] [--lockfile PATH]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import corpus_tools  # noqa: F401  (puts src on sys.path)
+
+from leagueaccounts.lcu_source import (LcuRankSource, LCU_USER, CURRENT_SUMMONER, RANKED_STATS,
+                                       REGION_LOCALE, SOLO_QUEUE)
+from leagueaccounts.models import Account
+from leagueaccounts.rank_sources import RankSource
+
+DEFAULT_SUMMONER = {
+    'gameName': 'Stand In', 'tagLine': 'LCU', 'summonerLevel': 287, 'puuid': 'standin-puuid',
+}
+DEFAULT_QUEUE = {
+    'queueType': SOLO_QUEUE, 'tier': 'PLATINUM', 'division': 'II', 'leaguePoints': 63,
+    'previousSeasonHighestTier': 'EMERALD', 'previousSeasonHighestDivision': 'IV',
+    'previousSeasonEndTier': 'PLATINUM', 'previousSeasonEndDivision': 'I',
+}
+
+
+class LcuState:
+    def __init__(self, password='standin-secret'):
+        self.password = password
+        self.summoner = dict(DEFAULT_SUMMONER)
+        self.queue = dict(DEFAULT_QUEUE)
+        self.region = 'EUW'
+        self.logged_in = True
+        self.closed = False
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+class LcuHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        expected = base64.b64encode(f'{LCU_USER}:{self.state.password}'.encode()).decode()
+        return self.headers.get('Authorization') == f'Basic {expected}'
+
+    def do_GET(self):
+        state = self.state
+        if state.closed:
+            # Client exited: kept-alive connections die with it
+            self.close_connection = True
+            return
+        with state.lock:
+            state.requests += 1
+        if not self._authorized():
+            self._send_json(401, {'message': 'unauthorized'})
+        elif self.path == REGION_LOCALE:
+            self._send_json(200, {'region': state.region, 'webRegion': state.region.lower(), 'locale': 'en_GB'})
+        elif not state.logged_in:
+            self._send_json(404, {'message': 'No current summoner'})
+        elif self.path == CURRENT_SUMMONER:
+            self._send_json(200, state.summoner)
+        elif self.path == RANKED_STATS:
+            self._send_json(200, {'queueMap': {SOLO_QUEUE: state.queue}, 'queues': [state.queue]})
+        else:
+            self._send_json(404, {'message': 'not found'})
+
+
+def start_lcu(state, lockfile_path, host='127.0.0.1', port=0):
+    """Serve the stand-in on a background thread and write its lockfile."""
+    handler = type('Handler', (LcuHandler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    write_lockfile(lockfile_path, server.server_address[1], state.password)
+    return server
+
+
+def write_lockfile(path, port, password):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'LeagueClient:{os.getpid()}:{port}:{password}:http')
+
+
+class ScraperStub(RankSource):
+    """Fallback that records which accounts reached the scraper."""
+    name = 'scraper'
+
+    def __init__(self):
+        self.calls = []
+
+    def summoner_url(self, account):
+        return f'https://scraper.invalid/{account.region}/{account.name}'
+
+    def fetch_rank(self, account, current_only=False, deadline=None, record=None):
+        self.calls.append(account.name)
+        return {'tier': 'Scraped', 'division': '', 'lp': '', 'level': '',
+                'reached_last_season': '', 'finished_last_season': ''}
+
+
+def run_check(lockfile_path):
+    state = LcuState()
+    server = start_lcu(state, lockfile_path)
+    scraper = ScraperStub()
+    source = LcuRankSource(scraper, paths=(lockfile_path,))
+    signed_in = Account(account_id='standin', name='Stand In#LCU', region='euw', region_display='EUW')
+    other = Account(account_id='other', name='Someone Else#EUW', region='euw', region_display='EUW')
+    wrong_region = Account(account_id='standin-na', name='Stand In#LCU', region='na', region_display='NA')
+    failures = []
+
+    def check(label, account, expected, current_only=False):
+        start = time.perf_counter()
+        result = source.fetch_rank(account, current_only=current_only)
+        elapsed = (time.perf_counter() - start) * 1000
+        ok = all(result.get(key) == value for key, value in expected.items())
+        print(f"   {'OK  ' if ok else 'FAIL'} {label:<40} {elapsed:7.2f} ms  {result}")
+        if not ok:
+            failures.append(label)
+
+    try:
+        check('signed-in account from the client', signed_in, {
+            'tier': 'Platinum', 'division': 'II', 'lp': '63', 'level': '287',
+            'reached_last_season': 'Emerald IV', 'finished_last_season': 'Platinum I'})
+        check('current_only drops season fields', signed_in, {'tier': 'Platinum'}, current_only=True)
+        check('other account falls back', other, {'tier': 'Scraped'})
+        check('same name, other region falls back', wrong_region, {'tier': 'Scraped'})
+
+        state.queue = {'queueType': SOLO_QUEUE, 'tier': 'CHALLENGER', 'division': 'NA', 'leaguePoints': 1204,
+                       'previousSeasonHighestTier': 'NONE', 'previousSeasonEndTier': ''}
+        source._identity = None
+        check('apex tier has no division', signed_in, {
+            'tier': 'Challenger', 'division': '', 'lp': '1204',
+            'reached_last_season': 'Unranked', 'finished_last_season': 'Unranked'})
+
+        state.queue = {'queueType': SOLO_QUEUE, 'tier': '', 'division': 'NA', 'leaguePoints': 0}
+        check('unranked matches scraper shape', signed_in, {'tier': 'Unranked', 'division': '', 'lp': ''})
+
+        state.logged_in = False
+        source._identity = None
+        check('logged out falls back', signed_in, {'tier': 'Scraped'})
+        state.logged_in = True
+
+        state.password = 'rotated'
+        source._identity = None
+        check('stale password falls back', signed_in, {'tier': 'Scraped'})
+        # A restarted client writes a new lockfile; the source picks it up
+        time.sleep(0.01)
+        write_lockfile(lockfile_path, server.server_address[1], state.password)
+        check('new lockfile is picked up', signed_in, {'tier': 'Unranked', 'level': '287'})
+
+        server.shutdown()
+        server.server_close()
+        state.closed = True
+        source._identity = None
+        check('client gone falls back', signed_in, {'tier': 'Scraped'})
+        os.remove(lockfile_path)
+        check('no lockfile falls back', signed_in, {'tier': 'Scraped'})
+    finally:
+        server.shutdown()
+
+    print(f"\nclient answered {source.hits}, scraper answered {len(scraper.calls)}, "
+          f"client requests {state.requests}")
+    if failures:
+        print(f"FAILED: {', '.join(failures)}")
+        sys.exit(1)
+    print("All checks passed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--serve', action='store_true')
+    mode.add_argument('--check', action='store_true')
+    parser.add_argument('--lockfile', help='where to write the lockfile (default: a temp file)')
+    parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args()
+
+    lockfile_path = args.lockfile or os.path.join(tempfile.mkdtemp(prefix='lcu-standin-'), 'lockfile')
+    if args.serve:
+        server = start_lcu(LcuState(), lockfile_path, port=args.port)
+        print(f"LCU stand-in on port {server.server_address[1]}, lockfile {lockfile_path} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        print("LCU rank source check")
+        print("=" * 40)
+        run_check(lockfile_path)
+
+
+if __name__ == "__main__":
+    main()
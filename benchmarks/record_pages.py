@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Record summoner pages into the benchmark corpus
+Fetches pages once from the live site (or generates synthetic ones),
+stores them under benchmarks/corpus and records the reference extractor's
+output as the expected result in manifest.json.
+
+Usage:
+    python benchmarks/record_pages.py euw "Name#TAG" [region name ...]
+    python benchmarks/record_pages.py --from-accounts
+    python benchmarks/record_pages.py --synthetic 20
+    python benchmarks/record_pages.py --update-expected
+
+--update-expected also registers any new hand-written .html fixture
+found under benchmarks/corpus.
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+
+from corpus_tools import CORPUS_DIR, CLOCK_FIELDS, REFERENCE_BACKEND, load_manifest, save_manifest, iter_pages
+from synthetic_pages import random_profile, render_profile
+
+from leagueaccounts.extractors import get_extractor
+from leagueaccounts.models import Account
+from leagueaccounts.rank_fetcher import RankFetcher
+from leagueaccounts.utils import get_accounts_file
+
+
+def _slug(text):
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', text).strip('_')
+
+
+def _expected(page_text):
+    result = get_extractor(REFERENCE_BACKEND).extract(page_text)
+    return {key: value for key, value in result.items() if key not in CLOCK_FIELDS}
+
+
+def record_live(manifest, targets, delay):
+    fetcher = RankFetcher()
+    for region, name in targets:
+        account = Account(account_id='', name=name, region=region, region_display=region.upper())
+        url = fetcher.summoner_url(account)
+        try:
+            response = fetcher.session.get(url, timeout=(fetcher.connect_timeout, fetcher.read_timeout))
+            response.raise_for_status()
+        except Exception as e:
+            print(f"   FAILED {region}/{name}: {e}")
+            continue
+        rel_path = f"recorded/{region}_{_slug(name)}.html"
+        (CORPUS_DIR / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (CORPUS_DIR / rel_path).write_bytes(response.content)
+        manifest['pages'][rel_path] = {
+            'source': 'recorded',
+            'url': url,
+            'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'encoding': response.encoding or 'utf-8',
+            'expected': _expected(response.text),
+        }
+        print(f"   OK {rel_path} ({len(response.content)} bytes)")
+        time.sleep(delay)
+
+
+def record_synthetic(manifest, count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        profile = random_profile(rng, f"Synthetic{i}#BENCH", 'euw')
+        page_text = render_profile(profile, seed=seed + i)
+        rel_path = f"synthetic/profile_{i:03d}.html"
+        (CORPUS_DIR / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (CORPUS_DIR / rel_path).write_text(page_text, encoding='utf-8')
+        manifest['pages'][rel_path] = {
+            'source': 'synthetic',
+            'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'encoding': 'utf-8',
+            'expected': _expected(page_text),
+        }
+        print(f"   OK {rel_path}")
+
+
+def update_expected(manifest):
+    # Register hand-written fixtures dropped into the corpus directory
+    for path in sorted(CORPUS_DIR.rglob('*.html')):
+        rel_path = path.relative_to(CORPUS_DIR).as_posix()
+        manifest['pages'].setdefault(rel_path, {'source': 'handwritten', 'encoding': 'utf-8'})
+    for rel_path, entry, page_text in iter_pages(manifest):
+        entry['expected'] = _expected(page_text)
+        print(f"   OK {rel_path}")
+
+
+def accounts_from_file():
+    with open(get_accounts_file(), 'r', encoding='utf-8') as f:
+        return [(acc['region'], acc['name']) for acc in json.load(f) if acc.get('name')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('targets', nargs='*', help='alternating region and summoner name')
+    parser.add_argument('--from-accounts', action='store_true', help='record every account in league_accounts.json')
+    parser.add_argument('--synthetic', type=int, metavar='N', help='generate N synthetic pages')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--delay', type=float, default=2.0, help='seconds between live requests')
+    parser.add_argument('--update-expected', action='store_true',
+                        help='recompute expected results for every page with the reference backend')
+    args = parser.parse_args()
+
+    if len(args.targets) % 2:
+        parser.error('targets must be region/name pairs')
+    targets = list(zip(args.targets[::2], args.targets[1::2]))
+    if args.from_accounts:
+        targets.extend(accounts_from_file())
+
+    # Recomputing every expectation is how an older manifest is brought up to date
+    manifest = load_manifest(check_version=not args.update_expected)
+    if targets:
+        record_live(manifest, targets, args.delay)
+    if args.synthetic:
+        record_synthetic(manifest, args.synthetic, args.seed)
+    if args.update_expected:
+        update_expected(manifest)
+    save_manifest(manifest)
+    print(f"\nCorpus: {len(manifest['pages'])} pages")
+
+
+if __name__ == "__main__":
+    main()
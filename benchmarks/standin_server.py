@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Local leagueofgraphs stand-in server
+Serves /summoner/{region}/{name} pages for load testing the refresh path
+without touching the real site. Point RankFetcher at it with
+RankFetcher(base_url='http://127.0.0.1:<port>').
+
+Pages come from the corpus (round-robin by name hash) or, with
+--synthetic, are rendered per summoner. Faults can be injected:
+  --latency fixed:0.05 | uniform:0.02,0.2 | lognormal:-3,0.8   (seconds)
+  --error-rate 0.02      fraction answered with HTTP 500
+  --throttle-rate 0.05   fraction answered with HTTP 429 + Retry-After
+  --reset-rate 0.01      fraction whose connection is reset mid-request
+  --drip 0.01            seconds to sleep between body chunks (slow drip)
+
+Usage: python benchmarks/standin_server.py [--port 8080] [options]
+"""
+
+import argparse
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote_plus
+
+from corpus_tools import load_manifest, iter_pages
+from synthetic_pages import random_profile, render_profile
+
+DRIP_CHUNK_SIZE = 2048
+
+
+def parse_latency(spec):
+    """Turn 'fixed:S', 'uniform:LO,HI' or 'lognormal:MU,SIGMA' into a sampler."""
+    if not spec:
+        return lambda rng: 0.0
+    kind, _, params = spec.partition(':')
+    values = [float(v) for v in params.split(',') if v]
+    if kind == 'fixed':
+        return lambda rng: values[0]
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == 'lognormal':
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+
+class StandInConfig:
+    def __init__(self, latency=None, error_rate=0.0, throttle_rate=0.0, reset_rate=0.0,
+                 drip=0.0, retry_after=1, synthetic=False, seed=0):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.reset_rate = reset_rate
+        self.drip = drip
+        self.retry_after = retry_after
+        self.synthetic = synthetic
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.pages = [text.encode('utf-8') for _, _, text in iter_pages(load_manifest())] if not synthetic else []
+        self.counters = {'requests': 0, 'ok': 0, 'errors': 0, 'throttled': 0, 'resets': 0, 'not_found': 0}
+        self.counters_lock = threading.Lock()
+
+    def roll(self):
+        with self.rng_lock:
+            return self.rng.random(), self.latency(self.rng)
+
+    def count(self, key):
+        with self.counters_lock:
+            self.counters[key] += 1
+
+    def page_for(self, region, name):
+        if self.synthetic:
+            seed = zlib.crc32(f'{region}/{name}'.encode('utf-8'))
+            profile = random_profile(random.Random(seed), name, region)
+            return render_profile(profile, seed=seed).encode('utf-8')
+        if not self.pages:
+            return None
+        return self.pages[zlib.crc32(name.encode('utf-8')) % len(self.pages)]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+    config = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_empty(self, status, headers=()):
+        self.send_response(status)
+        for key, value in headers:
+            self.send_header(key, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _reset_connection(self):
+        # SO_LINGER with a zero timeout makes close() send an RST
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        self.connection.close()
+        self.close_connection = True
+
+    def do_HEAD(self):
+        self._send_empty(200)
+
+    def do_GET(self):
+        config = self.config
+        config.count('requests')
+        roll, latency = config.roll()
+        if latency > 0:
+            time.sleep(latency)
+
+        parts = self.path.strip('/').split('/')
+        if len(parts) != 3 or parts[0] != 'summoner':
+            config.count('not_found')
+            self._send_empty(404)
+            return
+
+        threshold = config.reset_rate
+        if roll < threshold:
+            config.count('resets')
+            self._reset_connection()
+            return
+        threshold += config.throttle_rate
+        if roll < threshold:
+            config.count('throttled')
+            self._send_empty(429, [('Retry-After', str(config.retry_after))])
+            return
+        threshold += config.error_rate
+        if roll < threshold:
+            config.count('errors')
+            self._send_empty(500)
+            return
+
+        body = config.page_for(parts[1], unquote_plus(parts[2]))
+        if body is None:
+            config.count('not_found')
+            self._send_empty(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            if config.drip > 0:
+                for i in range(0, len(body), DRIP_CHUNK_SIZE):
+                    self.wfile.write(body[i:i + DRIP_CHUNK_SIZE])
+                    self.wfile.flush()
+                    time.sleep(config.drip)
+            else:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Streaming clients hang up once they have what they need
+            self.close_connection = True
+            return
+        config.count('ok')
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # Clients that stream a page hang up once they have what they need
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+def start_server(config, host='127.0.0.1', port=0):
+    """Start the stand-in on a background thread. Returns (server, base_url)."""
+    handler = type('Handler', (StandInHandler,), {'config': config})
+    server = StandInServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def add_config_arguments(parser):
+    parser.add_argument('--latency', help="e.g. fixed:0.05, uniform:0.02,0.2, lognormal:-3,0.8")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--reset-rate', type=float, default=0.0)
+    parser.add_argument('--drip', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--synthetic', action='store_true', help='render a distinct page per summoner')
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def config_from_args(args):
+    return StandInConfig(args.latency, args.error_rate, args.throttle_rate, args.reset_rate,
+                         args.drip, args.retry_after, args.synthetic, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    config = config_from_args(args)
+    if not config.synthetic and not config.pages:
+        print("ERROR: Corpus is empty; use --synthetic or record pages first")
+        sys.exit(1)
+    server, base_url = start_server(config, args.host, args.port)
+    print(f"Stand-in serving on {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n{config.counters}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Synthetic summoner pages shaped like leagueofgraphs.com profiles.
+Used to seed the benchmark corpus and by the local stand-in server; real
+recorded pages (record_pages.py) should be preferred wherever available.
+"""
+import html
+import random
+
+TIERS = ['Iron', 'Bronze', 'Silver', 'Gold', 'Platinum', 'Emerald', 'Diamond', 'Master', 'Grandmaster', 'Challenger']
+DIVISIONS = ['I', 'II', 'III', 'IV']
+APEX_TIERS = ('Master', 'Grandmaster', 'Challenger')
+CHAMPIONS = ['Ahri', 'Jinx', 'Thresh', 'LeeSin', 'Lux', 'Yasuo', 'Ezreal', 'Leona', 'Viego', 'Orianna']
+
+
+def random_profile(rng, name, region):
+    ranked = rng.random() > 0.15
+    tier = rng.choice(TIERS) if ranked else 'Unranked'
+    return {
+        'name': name,
+        'region': region,
+        'tier': tier,
+        'division': '' if not ranked or tier in APEX_TIERS else rng.choice(DIVISIONS),
+        'lp': str(rng.randint(0, 99)) if ranked else '',
+        'level': str(rng.randint(30, 900)),
+        'seasons': [
+            (label, f"{rng.choice(TIERS[:7])} {rng.choice(DIVISIONS)}", f"{rng.choice(TIERS[:7])} {rng.choice(DIVISIONS)}")
+            for label in ('Season 2023 (Split 1)', 'Season 2023 (Split 2)', 'Season 2024 (Split 1)',
+                          'Season 2024 (Split 2)', 'Season 2024 (Split 3)', 'Season 2025')
+            if rng.random() > 0.2
+        ],
+    }
+
+
+def _season_tag(label, reached, finished):
+    tooltip = (f"<itemname class='tagTitle brown'>{label}</itemname><br/>Ranked Solo/Duo<br/>"
+               f"This player reached {reached} during {label}. "
+               f"At the end of the season, this player was {finished}.")
+    return f'<div class="tag requireTooltip brown" tooltip="{html.escape(tooltip)}">{label.replace("Season ", "S")}</div>'
+
+
+def _match_row(rng, i):
+    champ = rng.choice(CHAMPIONS)
+    k, d, a = rng.randint(0, 20), rng.randint(0, 15), rng.randint(0, 30)
+    result = rng.choice(['victory', 'defeat'])
+    return (f'<tr class="match-{i}"><td class="championCellLight"><img src="/img/champions/{champ}.png" '
+            f'alt="{champ}" tooltip="{champ}"/></td><td class="resultCellLight"><div class="{result}Match">'
+            f'{result.title()}</div><div class="gameDuration">{rng.randint(15, 45)}min</div></td>'
+            f'<td class="kdaColumn"><span class="kills">{k}</span>/<span class="deaths">{d}</span>/'
+            f'<span class="assists">{a}</span></td><td class="itemsColumnLight">'
+            + ''.join(f'<img src="/img/items/{rng.randint(1000, 7000)}.png" class="item"/>' for _ in range(6))
+            + '</td></tr>')
+
+
+def render_profile(profile, matches=40, seed=0):
+    rng = random.Random(seed)
+    tier, division, lp = profile['tier'], profile['division'], profile['lp']
+    rank_text = f"{tier} {division}".strip() if tier != 'Unranked' else 'Unranked'
+    desc = f"{rank_text} - {lp} LP - {rng.randint(10, 400)} wins" if tier != 'Unranked' else 'Unranked - 0 wins'
+    name = html.escape(profile['name'])
+    parts = [
+        '<!DOCTYPE html>\n<html lang="en"><head>',
+        '<meta charset="utf-8"/>',
+        f'<title>{name} - {profile["region"].upper()} - League of Legends</title>',
+        f'<meta name="description" content="{html.escape(desc)}"/>',
+        f'<meta name="twitter:description" content="{html.escape(desc)}"/>',
+        '<meta name="twitter:card" content="summary"/>',
+        ''.join(f'<link rel="stylesheet" href="/css/bundle-{i}.css"/>' for i in range(6)),
+        '<script>window.dataLayer = window.dataLayer || []; var summonerLevelHint = "Level unknown";</script>',
+        '</head><body class="summoner"><div id="mainContent"><div class="pageBanner">',
+        f'<div class="bannerSubtitle"><span class="summonerName">{name}</span></div>',
+        f'<div class="bannerSubtitle summonerLevel">Level {profile["level"]}</div>',
+        '<div class="tags-box">',
+        ''.join(_season_tag(*season) for season in profile['seasons']),
+        '</div></div>',
+        '<div class="box leagueTierBox"><div class="leagueTier">' + html.escape(rank_text) + '</div>',
+    ]
+    if tier != 'Unranked':
+        parts.append(f'<div class="league-points">LP: <span class="leaguePoints">{lp}</span></div>')
+    parts.append('</div><table class="data_table relative recentGamesTable">')
+    parts.extend(_match_row(rng, i) for i in range(matches))
+    parts.append('</table>')
+    parts.append('<div id="footer">' + ''.join(f'<a href="/page/{i}">Link {i}</a>' for i in range(50)) + '</div>')
+    parts.append('<script>' + 'var x = 1;' * 200 + '</script></div></body></html>')
+    return '\n'.join(parts)
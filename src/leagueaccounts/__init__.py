@@ -12,11 +12,26 @@ __version__ = "1.2.0"
 __author__ = "LeagueAccounts Team"
 __description__ = "League of Legends Account Manager"
 
-# Import main components for easy access
-from .gui import LeagueAccountApp
-from .models import Account
-from .account_manager import AccountManager
-from .rank_fetcher import RankFetcher
+# Main components are imported on first access so that GUI and Windows-only
+# modules are not loaded by tools that only need the fetch/parse code
+_LAZY_EXPORTS = {
+    'LeagueAccountApp': '.gui',
+    'Account': '.models',
+    'AccountManager': '.account_manager',
+    'RankFetcher': '.rank_fetcher',
+    'FetchService': '.fetch_service',
+    'RankSource': '.rank_sources',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 from .main import main
 
 __all__ = [
@@ -24,6 +39,8 @@ __all__ = [
     'Account', 
     'AccountManager',
     'RankFetcher',
+    'FetchService',
+    'RankSource',
     'main',
     '__version__',
     '__author__',
@@ -1,115 +1,394 @@
-from . import windows_credential as cred
 import json
-import os
+import threading
+import time
 from dataclasses import asdict
-from .utils import get_accounts_file, rank_sort_key
+from .utils import get_accounts_file, rank_sort_key, rank_score, tier_score_range, REGION_MAP
 from .models import Account
+from .fetch_service import FetchService, DEFAULT_RUN_TIMEOUT
+from .instrumentation import RunReport
+from .persistence import open_store, WriteBehindWriter
+from .credential_backends import default_backend
 
 KEYRING_SERVICE = 'LeagueAccounts'
 
+# Incremental refresh: an account is refetched once older than its TTL, which
+# doubles with every fetch that found no change, between these bounds (seconds)
+DEFAULT_MIN_TTL = 15 * 60
+DEFAULT_MAX_TTL = 24 * 60 * 60
+RANK_FIELDS = ('tier', 'division', 'lp', 'level')
+
+# Passwords are read from the credential store when first needed and kept
+# only briefly, for repeated copies of the same account
+PASSWORD_TTL = 30.0
+PASSWORD_CACHE_SIZE = 8
+
+
+class PasswordCache:
+    """Recently used passwords, each forgotten ttl seconds after it was stored."""
+
+    def __init__(self, ttl=PASSWORD_TTL, max_entries=PASSWORD_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (time.monotonic() expiry, password), oldest first
+        self._entries = {}
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            self._purge()
+            entry = self._entries.get(key)
+            return entry[1] if entry else None
+
+    def put(self, key, password):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, password)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._schedule()
+
+    def forget(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def __len__(self):
+        with self._lock:
+            self._purge()
+            return len(self._entries)
+
+    def _purge(self):
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+
+    def _schedule(self):
+        """Start a timer for the oldest entry's expiry, so nothing outlives its ttl unasked. Lock held."""
+        if self._timer is not None or not self._entries:
+            return
+        expires = next(iter(self._entries.values()))[0]
+        self._timer = threading.Timer(max(0.0, expires - time.monotonic()), self._expire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _expire(self):
+        with self._lock:
+            self._timer = None
+            self._purge()
+            self._schedule()
+
+
 class AccountManager:
-    def __init__(self, root, rank_fetcher):
+    def __init__(self, root, rank_fetcher, fetch_service=None, store=None, credentials=None):
         self.root = root
         self.rank_fetcher = rank_fetcher
+        self.fetch_service = fetch_service or FetchService(rank_fetcher)
         self.accounts = []
+        # account_key(region, account_id) -> Account, kept in step with self.accounts
+        self._index = {}
         self.accounts_file = get_accounts_file()
+        # JSON snapshot and journal unless another store is given or configured
+        self.store = store or open_store(self.accounts_file)
+        self.writer = WriteBehindWriter(self.store, self._records, on_error=self._on_save_error)
+        self.min_ttl = DEFAULT_MIN_TTL
+        self.max_ttl = DEFAULT_MAX_TTL
+        self.credentials = credentials or default_backend()
+        self.passwords = PasswordCache()
+
+    @staticmethod
+    def account_key(region, account_id):
+        """Index key for an account; region may be the code ('euw') or display name ('EUW')."""
+        return REGION_MAP.get(region, region).lower(), account_id.strip().lower()
+
+    def get(self, region, account_id):
+        return self._index.get(self.account_key(region, account_id))
+
+    def contains(self, region, account_id):
+        return self.account_key(region, account_id) in self._index
+
+    def remove(self, region, account_id):
+        """Remove an account from memory and return it, or None if there is none."""
+        acc = self._index.pop(self.account_key(region, account_id), None)
+        if acc is not None:
+            self.accounts.remove(acc)
+        return acc
+
+    def _add(self, acc):
+        """Add an account to the list and index. Returns False if the key is taken."""
+        key = self.account_key(acc.region, acc.account_id)
+        if key in self._index:
+            return False
+        self._index[key] = acc
+        self.accounts.append(acc)
+        return True
 
     def load_accounts(self):
         self.accounts.clear()
-        if os.path.exists(self.accounts_file):
-            with open(self.accounts_file, "r", encoding="utf-8") as f:
-                loaded_accounts = json.load(f)
-                for acc in loaded_accounts:
-                    region = acc.get('region')
-                    account_id = acc.get('account_id')
-                    try:
-                        password = cred.get_password(KEYRING_SERVICE, f'{region}:{account_id}') or ''
-                    except Exception:
-                        password = ''
-                    acc_obj = Account(
-                        account_id=acc.get('account_id', ''),
-                        name=acc.get('name', ''),
-                        region=region,
-                        region_display=acc.get('region_display', region),
-                        password=password,
-                        description=acc.get('description', ''),
-                        tier=acc.get('tier', 'Unranked'),
-                        division=acc.get('division', ''),
-                        lp=acc.get('lp', ''),
-                        level=acc.get('level', ''),
-                        reached_last_season=acc.get('reached_last_season', 'N/A'),
-                        finished_last_season=acc.get('finished_last_season', 'N/A')
-                    )
-                    self.accounts.append(acc_obj)
+        self._index.clear()
+        for acc in self.store.load():
+            region = acc.get('region')
+            account_id = acc.get('account_id')
+            # Passwords stay in the credential store until needed (get_password)
+            acc_obj = Account(
+                account_id=acc.get('account_id', ''),
+                name=acc.get('name', ''),
+                region=region,
+                region_display=acc.get('region_display', region),
+                description=acc.get('description', ''),
+                tier=acc.get('tier', 'Unranked'),
+                division=acc.get('division', ''),
+                lp=acc.get('lp', ''),
+                level=acc.get('level', ''),
+                reached_last_season=acc.get('reached_last_season', 'N/A'),
+                finished_last_season=acc.get('finished_last_season', 'N/A'),
+                last_fetched=acc.get('last_fetched', 0.0),
+                last_changed=acc.get('last_changed', 0.0),
+                unchanged_fetches=acc.get('unchanged_fetches', 0),
+                season_history=acc.get('season_history', {})
+            )
+            if not self._add(acc_obj):
+                print(f"Skipping duplicate account {region}:{account_id}")
         self.accounts.sort(key=lambda a: rank_sort_key(a.tier, a.division, a.lp))
 
-    def save_accounts(self):
+    @staticmethod
+    def _record(acc):
+        """Account dict as stored on disk; passwords live in the credential store."""
+        acc_dict = acc.__dict__.copy()
+        acc_dict.pop('password', None)
+        return acc_dict
+
+    def _records(self):
+        return [self._record(acc) for acc in list(self.accounts)]
+
+    @staticmethod
+    def _credential_name(acc):
+        return f'{acc.region}:{acc.account_id}'
+
+    def get_password(self, acc, cache=True):
+        """Read an account's password from the credential store, or '' if it has none.
+
+        With cache set it is kept for PASSWORD_TTL seconds, so copying the
+        same account again does not go back to the store; one-off uses
+        (auto-type, export) should pass cache=False.
+        """
+        name = self._credential_name(acc)
+        password = self.passwords.get(name)
+        if password is not None:
+            return password
         try:
-            to_save = []
-            for acc in self.accounts:
-                acc_dict = acc.__dict__.copy()
-                if 'password' in acc_dict:
-                    del acc_dict['password']
-                to_save.append(acc_dict)
-            with open(self.accounts_file, "w", encoding="utf-8") as f:
-                json.dump(to_save, f, indent=2)
-        except PermissionError as e:
-            import tkinter.messagebox as mb
-            mb.showerror('Permission Error',
-                        f'Cannot save accounts file. Permission denied.\n\n'
-                        f'File: {self.accounts_file}\n'
-                        f'Error: {str(e)}\n\n'
-                        f'Please check your user permissions or run as administrator.')
-            raise
-        except Exception as e:
+            password = self.credentials.get_password(KEYRING_SERVICE, name) or ''
+        except Exception:
+            password = ''
+        if password and cache:
+            self.passwords.put(name, password)
+        return password
+
+    def forget_password(self, acc=None):
+        """Drop an account's cached password, or every cached password."""
+        if acc is None:
+            self.passwords.clear()
+        else:
+            self.passwords.forget(self._credential_name(acc))
+
+    def _take_password(self, acc):
+        """Move a just-entered password off the account into the cache."""
+        if acc.password:
+            self.passwords.put(self._credential_name(acc), acc.password)
+            acc.password = ''
+
+    def _log_change(self, op, acc, fields=None):
+        """Queue a change for the store's journal and schedule a write."""
+        change = {'op': op, 'key': [acc.region, acc.account_id]}
+        if fields is not None:
+            change['fields'] = fields
+        self.writer.mark_dirty(change)
+
+    def save_accounts(self):
+        """Schedule a save. Changes within the writer's delay are written together in the background.
+
+        Only changes made through AccountManager methods (add_account,
+        update_account, apply_rank_info, delete_account, import_accounts)
+        reach the journal; they also schedule the save themselves.
+        """
+        self.writer.mark_dirty()
+
+    def flush(self):
+        """Write unsaved changes now. Returns False if the write failed (the user has been told)."""
+        return self.writer.flush()
+
+    def close(self):
+        """Write unsaved changes and stop scheduling saves; call on exit."""
+        saved = self.writer.close()
+        self.store.close()
+        self.credentials.close()
+        self.passwords.clear()
+        return saved
+
+    def _on_save_error(self, e):
+        # Runs on the writer thread; message boxes belong on the Tk thread
+        print(f"Error saving accounts: {e}")
+        if self.root is None:
+            return
+        if isinstance(e, PermissionError):
+            title = 'Permission Error'
+            message = (f'Cannot save accounts file. Permission denied.\n\n'
+                       f'File: {self.store.path}\n'
+                       f'Error: {str(e)}\n\n'
+                       f'Please check your user permissions or run as administrator.')
+        else:
+            title = 'Save Error'
+            message = (f'Failed to save accounts file.\n\n'
+                       f'File: {self.store.path}\n'
+                       f'Error: {str(e)}')
+
+        def show():
             import tkinter.messagebox as mb
-            mb.showerror('Save Error',
-                        f'Failed to save accounts file.\n\n'
-                        f'File: {self.accounts_file}\n'
-                        f'Error: {str(e)}')
-            raise
+            mb.showerror(title, message)
+        try:
+            self.root.after(0, show)
+        except Exception:
+            # Tk already gone (saving on exit); the error was printed above
+            pass
 
     def add_account(self, account: Account):
-        self.accounts.append(account)
+        if not self._add(account):
+            raise ValueError(f"Account {account.account_id} ({account.region_display}) is already added.")
+        self._take_password(account)
         self.accounts.sort(key=lambda a: rank_sort_key(a.tier, a.division, a.lp))
-        self.save_accounts()
+        self._log_change('add', account, self._record(account))
+
+    def update_account(self, acc, **fields):
+        """Set account fields (e.g. name, description) and save the ones that changed."""
+        changed = {}
+        for name, value in fields.items():
+            if getattr(acc, name) != value:
+                setattr(acc, name, value)
+                changed[name] = value
+        changed.pop('password', None)
+        if changed:
+            self._log_change('set', acc, changed)
+        return bool(changed)
 
     def delete_account(self, account_id, region):
-        self.accounts = [acc for acc in self.accounts if not (acc.account_id == account_id and acc.region == region)]
+        acc = self.remove(region, account_id)
+        self.passwords.forget(f'{region}:{account_id}')
         try:
-            cred.delete_password(KEYRING_SERVICE, f'{region}:{account_id}')
+            self.credentials.delete_password(KEYRING_SERVICE, f'{region}:{account_id}')
         except Exception:
             pass
-        self.save_accounts()
+        if acc is not None:
+            self._log_change('del', acc)
 
-    def refresh_ranks(self):
-        for acc in self.accounts:
-            rank_info = self.rank_fetcher.fetch_rank(acc)
-            acc.tier = rank_info.get('tier', 'Unranked')
-            acc.division = rank_info.get('division', '')
-            acc.lp = rank_info.get('lp', '')
-            acc.level = rank_info.get('level', '')
+    def apply_rank_info(self, acc, rank_info):
+        """Copy fetched rank info onto an account. Returns False if the account kept its previous values."""
+        # A failed fetch must not wipe data from an earlier successful one
+        if rank_info.get('error') and acc.has_rank_data():
+            return False
+        record = self._record(acc)
+        before = tuple(getattr(acc, f) for f in RANK_FIELDS)
+        acc.tier = rank_info.get('tier', 'Unranked')
+        acc.division = rank_info.get('division', '')
+        acc.lp = rank_info.get('lp', '')
+        acc.level = rank_info.get('level', '')
+        # Current-rank-only fetches leave the last-season columns untouched
+        if 'reached_last_season' in rank_info:
             acc.reached_last_season = rank_info.get('reached_last_season', 'N/A')
             acc.finished_last_season = rank_info.get('finished_last_season', 'N/A')
+        if 'season_history' in rank_info:
+            # Merged, since the local client only reports the previous season
+            acc.season_history = {**acc.season_history, **rank_info['season_history']}
+        if not rank_info.get('error'):
+            now = time.time()
+            acc.last_fetched = now
+            if tuple(getattr(acc, f) for f in RANK_FIELDS) != before:
+                acc.last_changed = now
+                acc.unchanged_fetches = 0
+            else:
+                acc.unchanged_fetches += 1
+        changed = {key: value for key, value in self._record(acc).items() if record.get(key) != value}
+        if changed:
+            self._log_change('set', acc, changed)
+        return True
+
+    def refresh_ttl(self, acc):
+        """Seconds before an account is due again: short while its rank moves, longer once dormant."""
+        return min(self.max_ttl, self.min_ttl * 2 ** min(acc.unchanged_fetches, 16))
+
+    def is_stale(self, acc, now=None):
+        now = time.time() if now is None else now
+        return now - acc.last_fetched >= self.refresh_ttl(acc)
+
+    def _store_query(self, name, *args):
+        """Accounts found by one of the store's indexed queries, or None if the store has no such query."""
+        query = getattr(self.store, name, None)
+        if query is None:
+            return None
+        # Changes still waiting in the write-behind writer must reach the store first
+        self.writer.flush()
+        found = (self.get(r.get('region', ''), r.get('account_id', '')) for r in query(*args))
+        return [acc for acc in found if acc is not None]
+
+    def stale_accounts(self, now=None):
+        now = time.time() if now is None else now
+        found = self._store_query('stale', now, self.min_ttl, self.max_ttl)
+        if found is None:
+            found = [acc for acc in self.accounts if self.is_stale(acc, now)]
+        return found
+
+    def search_accounts(self, text):
+        """Accounts whose name or ID contains text (case-insensitive)."""
+        found = self._store_query('search', text)
+        if found is None:
+            text = text.lower()
+            found = [acc for acc in self.accounts if text in acc.name.lower() or text in acc.account_id.lower()]
+        return found
+
+    def accounts_by_rank(self, lowest, highest):
+        """Accounts ranked from tier lowest up to tier highest (e.g. 'Gold', 'Diamond')."""
+        found = self._store_query('by_rank', lowest, highest)
+        if found is None:
+            low, high = tier_score_range(lowest)[0], tier_score_range(highest)[1]
+            found = [acc for acc in self.accounts if low <= rank_score(acc.tier, acc.division, acc.lp) <= high]
+        return found
+
+    def refresh_ranks(self, current_only=False, timeout=DEFAULT_RUN_TIMEOUT, full=False):
+        """Refetch ranks; only accounts past their TTL unless full is set."""
+        accounts = list(self.accounts) if full else self.stale_accounts()
+        report = RunReport('full refresh' if full else 'refresh')
+        futures = self.fetch_service.submit_many(accounts, current_only=current_only, timeout=timeout,
+                                                 report=report)
+        for acc, future in zip(accounts, futures):
+            self.apply_rank_info(acc, future.result())
         self.accounts.sort(key=lambda a: rank_sort_key(a.tier, a.division, a.lp))
         self.save_accounts()
+        self.flush()
+        report.finish()
+        return report
 
     def export_accounts(self):
         """Export all accounts including passwords as a JSON string."""
+        # One bulk read rather than a credential store round trip per account
+        try:
+            passwords = self.credentials.read_many(KEYRING_SERVICE, [self._credential_name(acc)
+                                                                     for acc in self.accounts])
+        except Exception as e:
+            print(f"Bulk password read failed, reading one by one: {e}")
+            passwords = {}
         export_data = []
         for acc in self.accounts:
             acc_dict = asdict(acc)
-            # Use in-memory password; fall back to credential store if empty
-            if not acc_dict.get('password'):
-                try:
-                    acc_dict['password'] = cred.get_password(
-                        KEYRING_SERVICE, f'{acc.region}:{acc.account_id}'
-                    ) or ''
-                except Exception:
-                    acc_dict['password'] = ''
-            # Also update in-memory account if we recovered the password
-            if acc_dict['password'] and not acc.password:
-                acc.password = acc_dict['password']
+            name = self._credential_name(acc)
+            if name in passwords:
+                acc_dict['password'] = passwords[name] or ''
+            else:
+                acc_dict['password'] = self.get_password(acc, cache=False)
             export_data.append(acc_dict)
         return json.dumps(export_data, indent=2)
 
@@ -120,6 +399,7 @@ class AccountManager:
             raise ValueError("Expected a JSON array of accounts.")
         added = 0
         skipped = 0
+        passwords = {}
         for acc_dict in data:
             account_id = acc_dict.get('account_id', '').strip()
             region = acc_dict.get('region', '').strip()
@@ -127,8 +407,7 @@ class AccountManager:
                 skipped += 1
                 continue
             # Skip duplicates
-            if any(a.account_id.lower() == account_id.lower() and a.region == region
-                   for a in self.accounts):
+            if self.contains(region, account_id):
                 skipped += 1
                 continue
             password = acc_dict.pop('password', '')
@@ -144,16 +423,20 @@ class AccountManager:
                 level=acc_dict.get('level', ''),
                 reached_last_season=acc_dict.get('reached_last_season', 'N/A'),
                 finished_last_season=acc_dict.get('finished_last_season', 'N/A'),
-                password=password
+                last_fetched=acc_dict.get('last_fetched', 0.0),
+                last_changed=acc_dict.get('last_changed', 0.0),
+                unchanged_fetches=acc_dict.get('unchanged_fetches', 0),
+                season_history=acc_dict.get('season_history', {})
             )
             if password:
-                try:
-                    cred.set_password(KEYRING_SERVICE, f'{region}:{account_id}', password)
-                except Exception:
-                    pass
-            self.accounts.append(acc)
+                passwords[self._credential_name(acc)] = password
+            self._add(acc)
+            self._log_change('add', acc, self._record(acc))
             added += 1
+        if passwords:
+            try:
+                self.credentials.write_many(KEYRING_SERVICE, passwords)
+            except Exception as e:
+                print(f"Error storing imported passwords: {e}")
         self.accounts.sort(key=lambda a: rank_sort_key(a.tier, a.division, a.lp))
-        if added > 0:
-            self.save_accounts()
         return added, skipped
@@ -0,0 +1,116 @@
+"""
+Bridge between the Tk main loop and an asyncio event loop.
+The loop runs on one dedicated daemon thread; coroutines are scheduled
+onto it from any thread and their results are handed back to Tk with
+root.after, so callbacks always run on the GUI thread.
+"""
+import asyncio
+import threading
+
+
+class AsyncBridge:
+    def __init__(self, root=None):
+        self.root = root
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """The bridge's event loop, started on first use."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    ready = threading.Event()
+                    self._thread = threading.Thread(target=self._run_loop, args=(loop, ready),
+                                                    name='rank-fetch-async', daemon=True)
+                    self._thread.start()
+                    ready.wait()
+                    self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _run_loop(loop, ready):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def _deliver(self, func, *args):
+        # Tk is not thread-safe: hop onto the main loop when there is one
+        if self.root is not None:
+            self.root.after(0, lambda: func(*args))
+        else:
+            func(*args)
+
+    def submit(self, coro, callback=None, errback=None):
+        """Schedule a coroutine on the loop. Returns a concurrent.futures.Future.
+
+        callback(result) or errback(exception) runs on the Tk thread when the
+        coroutine finishes; nothing is called if it was cancelled.
+        future.cancel() cancels the coroutine on the loop.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        def done(f):
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is None:
+                if callback is not None:
+                    self._deliver(callback, f.result())
+            elif errback is not None:
+                self._deliver(errback, error)
+            else:
+                print(f"Async task failed: {error}")
+        future.add_done_callback(done)
+        return future
+
+    def fetch_many(self, rank_fetcher, accounts, callback=None, on_complete=None, **kwargs):
+        """Run rank_fetcher.fetch_many on the loop.
+
+        callback(account, rank_info) is delivered to the Tk thread as each
+        account completes and on_complete(results) once all have. Extra
+        keyword arguments go to fetch_many. Cancel the returned future to
+        abort every fetch still in flight.
+        """
+        def on_fetched(account, rank_info):
+            if callback is not None:
+                self._deliver(callback, account, rank_info)
+
+        return self.submit(rank_fetcher.fetch_many(accounts, callback=on_fetched, **kwargs),
+                           callback=on_complete)
+
+    def cancel_all(self):
+        """Cancel every task running on the loop."""
+        if self._loop is None:
+            return
+
+        def cancel():
+            for task in asyncio.all_tasks():
+                task.cancel()
+        self._loop.call_soon_threadsafe(cancel)
+
+    def shutdown(self, rank_fetcher=None, timeout=5.0):
+        """Cancel outstanding work, close the fetcher's async session and stop the loop."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        async def stop():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if rank_fetcher is not None:
+                await rank_fetcher.aclose()
+
+        try:
+            asyncio.run_coroutine_threadsafe(stop(), loop).result(timeout)
+        except Exception as e:
+            print(f"Async loop did not stop cleanly: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
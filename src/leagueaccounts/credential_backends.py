@@ -0,0 +1,148 @@
+"""
+Credential backends.
+AccountManager keeps passwords in a CredentialBackend rather than calling
+the Windows Credential Manager directly. Besides single get/set/delete,
+a backend lists or reads a whole service's credentials and writes many
+at once, so bulk operations (import, export) cost one round trip where
+the store allows it instead of one or two per account.
+
+WindowsCredentialBackend is the real store. MemoryCredentialBackend and
+FileCredentialBackend (plain-text JSON, for development only) let the
+manager and benchmarks run on other platforms.
+Pick one with LEAGUEACCOUNTS_CREDENTIALS=windows|memory|file.
+"""
+import json
+import os
+import sys
+import threading
+
+CREDENTIALS_ENV = 'LEAGUEACCOUNTS_CREDENTIALS'
+
+
+class CredentialBackend:
+    """Passwords stored per (service, username)."""
+    name = 'base'
+
+    def get_password(self, service, username):
+        """The password, or None if there is none."""
+        raise NotImplementedError
+
+    def set_password(self, service, username, password):
+        raise NotImplementedError
+
+    def delete_password(self, service, username):
+        raise NotImplementedError
+
+    def enumerate(self, service):
+        """{username: password} of every credential stored for service."""
+        raise NotImplementedError
+
+    def read_many(self, service, usernames):
+        """{username: password or None} for each of usernames."""
+        stored = self.enumerate(service)
+        return {username: stored.get(username) for username in usernames}
+
+    def write_many(self, service, passwords):
+        """Store every {username: password} item."""
+        for username, password in passwords.items():
+            self.set_password(service, username, password)
+
+    def close(self):
+        pass
+
+
+class WindowsCredentialBackend(CredentialBackend):
+    name = 'windows'
+
+    def __init__(self):
+        from . import windows_credential
+        self._cred = windows_credential
+
+    def get_password(self, service, username):
+        return self._cred.get_password(service, username)
+
+    def set_password(self, service, username, password):
+        self._cred.set_password(service, username, password)
+
+    def delete_password(self, service, username):
+        self._cred.delete_password(service, username)
+
+    def enumerate(self, service):
+        return self._cred.enumerate_credentials(service)
+
+    def read_many(self, service, usernames):
+        usernames = list(usernames)
+        # A few reads are cheaper than listing every credential on the machine
+        if len(usernames) <= 2:
+            return {username: self.get_password(service, username) for username in usernames}
+        return super().read_many(service, usernames)
+
+
+class MemoryCredentialBackend(CredentialBackend):
+    """Credentials held in a dict for the life of the process."""
+    name = 'memory'
+
+    def __init__(self):
+        # service -> {username: password}
+        self._services = {}
+        self._lock = threading.Lock()
+
+    def get_password(self, service, username):
+        with self._lock:
+            return self._services.get(service, {}).get(username)
+
+    def set_password(self, service, username, password):
+        self.write_many(service, {username: password})
+
+    def delete_password(self, service, username):
+        with self._lock:
+            self._services.get(service, {}).pop(username, None)
+            self._changed()
+
+    def enumerate(self, service):
+        with self._lock:
+            return dict(self._services.get(service, {}))
+
+    def write_many(self, service, passwords):
+        with self._lock:
+            self._services.setdefault(service, {}).update(passwords)
+            self._changed()
+
+    def _changed(self):
+        """Called with the lock held after every change."""
+
+
+class FileCredentialBackend(MemoryCredentialBackend):
+    """Credentials in a plain-text JSON file. Not secure: development and benchmarks only."""
+    name = 'file'
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.writes = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._services = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    def _changed(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._services, f)
+        os.replace(tmp_path, self.path)
+        self.writes += 1
+
+
+def default_backend(kind=None):
+    """Backend named by kind or $LEAGUEACCOUNTS_CREDENTIALS; Windows on Windows, else memory."""
+    kind = (kind or os.environ.get(CREDENTIALS_ENV) or
+            ('windows' if sys.platform == 'win32' else 'memory')).lower()
+    if kind == 'windows':
+        return WindowsCredentialBackend()
+    if kind == 'memory':
+        return MemoryCredentialBackend()
+    if kind == 'file':
+        from .utils import get_credentials_file
+        return FileCredentialBackend(get_credentials_file())
+    raise ValueError(f"Unknown credential backend {kind!r}")
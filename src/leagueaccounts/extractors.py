@@ -0,0 +1,430 @@
+"""
+Rank extraction backends for summoner pages.
+
+'bs4'  - reference implementation on a full BeautifulSoup (html.parser) DOM.
+'fast' - single-pass tokenizer scan with precompiled patterns; no DOM is built.
+
+Both backends return the same rank info dict for the same page.
+"""
+import html
+import re
+from html.parser import HTMLParser
+
+from .utils import last_season_label
+
+LEVEL_SELECTORS = [
+    'div.summonerLevel',
+    'span.summonerLevel',
+    '.summonerLevel',
+    'div[class*="level"]',
+    'span[class*="level"]',
+    '.profile-level',
+    '.summoner-level'
+]
+LEVEL_PATTERNS = [
+    r'Level (\d+)',
+    r'(\d+)',
+    r'Lvl (\d+)',
+    r'Lv (\d+)'
+]
+CURRENT_FIELDS = ('tier', 'division', 'lp', 'level')
+# season_history maps each season (or split) label on the page to [reached, finished];
+# the last-season fields are read from it
+SEASON_FIELDS = ('reached_last_season', 'finished_last_season', 'season_history')
+ALL_FIELDS = CURRENT_FIELDS + SEASON_FIELDS
+SEASON_TOOLTIP = r'This player reached ([A-Za-z]+(?:\s+\d+LP)?(?:\s+[IV]+)?) during ([^.]+?)\. At the end of the (?:season|split), this player was ([A-Za-z]+(?:\s+\d+LP)?(?:\s+[IV]+)?)\.'
+
+
+class Bs4Extractor:
+    name = 'bs4'
+
+    def extract(self, page_html, fields=ALL_FIELDS):
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(page_html, 'html.parser')
+        result = {}
+        if 'level' in fields:
+            result['level'] = self._level(soup)
+        if 'lp' in fields:
+            result['lp'] = self._lp(soup)
+        if 'tier' in fields or 'division' in fields:
+            result['tier'], result['division'] = self._rank(soup)
+        if any(f in SEASON_FIELDS for f in fields):
+            history = self._season_history(soup)
+            result['season_history'] = history
+            result['reached_last_season'], result['finished_last_season'] = last_season(history)
+        return {key: result[key] for key in fields}
+
+    def _level(self, soup):
+        level = ''
+        # Try multiple selectors for level information
+        for selector in LEVEL_SELECTORS:
+            level_element = soup.select_one(selector)
+            if level_element:
+                level_text = level_element.get_text().strip()
+                # Try different patterns to extract level number
+                for pattern in LEVEL_PATTERNS:
+                    level_match = re.search(pattern, level_text)
+                    if level_match:
+                        level = level_match.group(1)
+                        break
+                if level:
+                    break
+
+        # If still no level found, try looking in meta tags or other elements
+        if not level:
+            # Look for level in any text containing "Level" or "Lvl"
+            for element in soup.find_all(text=re.compile(r'[Ll]evel|[Ll]vl')):
+                level_match = re.search(r'[Ll]evel\s*(\d+)|[Ll]vl\s*(\d+)', element)
+                if level_match:
+                    level = level_match.group(1) or level_match.group(2)
+                    break
+        return level
+
+    def _lp(self, soup):
+        lp = ''
+        lp_div = soup.select_one('div.league-points')
+        if lp_div:
+            lp_span = lp_div.select_one('span.leaguePoints')
+            if lp_span:
+                lp = lp_span.get_text().strip()
+        return lp
+
+    def _rank(self, soup):
+        import bs4
+        tier = 'Unranked'
+        division = ''
+        meta_desc = soup.find('meta', attrs={'name': 'twitter:description'})
+        if isinstance(meta_desc, bs4.element.Tag) and meta_desc.has_attr('content'):
+            desc = meta_desc['content']
+            if isinstance(desc, str) and ' - ' in desc:
+                rank_part = desc.split(' - ')[0]
+                match = re.search(r'([A-Za-z]+)\s+([IV]+)', rank_part)
+                if match:
+                    tier = match.group(1)
+                    division = match.group(2)
+                else:
+                    match = re.search(r'([A-Za-z]+)', rank_part)
+                    if match:
+                        tier = match.group(1)
+                        division = ''
+        return tier, division
+
+    def _season_history(self, soup):
+        history = {}
+        for div in soup.find_all('div', attrs={'tooltip': True}):
+            season = season_from_tooltip(html.unescape(div.get('tooltip', '')))
+            if season:
+                label, reached, finished = season
+                history.setdefault(label, [reached, finished])
+        return history
+
+
+_LEVEL_RES = [re.compile(p) for p in LEVEL_PATTERNS]
+_LEVEL_TEXT_RE = re.compile(r'[Ll]evel|[Ll]vl')
+_LEVEL_FALLBACK_RE = re.compile(r'[Ll]evel\s*(\d+)|[Ll]vl\s*(\d+)')
+_RANK_DIVISION_RE = re.compile(r'([A-Za-z]+)\s+([IV]+)')
+_RANK_TIER_RE = re.compile(r'([A-Za-z]+)')
+_SEASON_TOOLTIP_RE = re.compile(SEASON_TOOLTIP)
+
+# Tags html.parser's tree builder closes immediately
+_VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+    'command', 'frame', 'image', 'isindex', 'nextid', 'spacer', 'menuitem',
+])
+# bs4 gives strings inside these their own string types, which get_text() skips
+_RAW_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+
+def _level_selector_matches(tag, classes):
+    """Return the indexes of LEVEL_SELECTORS matched by a tag, in selector order."""
+    tokens = classes.split()
+    joined = ' '.join(tokens)
+    matches = []
+    if 'summonerLevel' in tokens:
+        if tag == 'div':
+            matches.append(0)
+        if tag == 'span':
+            matches.append(1)
+        matches.append(2)
+    if 'level' in joined:
+        if tag == 'div':
+            matches.append(3)
+        if tag == 'span':
+            matches.append(4)
+    if 'profile-level' in tokens:
+        matches.append(5)
+    if 'summoner-level' in tokens:
+        matches.append(6)
+    return matches
+
+
+def level_from_text(text):
+    for level_re in _LEVEL_RES:
+        level_match = level_re.search(text)
+        if level_match:
+            return level_match.group(1)
+    return ''
+
+
+def rank_from_description(desc):
+    """Parse (tier, division) from the twitter:description meta content."""
+    if ' - ' in desc:
+        rank_part = desc.split(' - ')[0]
+        match = _RANK_DIVISION_RE.search(rank_part)
+        if match:
+            return match.group(1), match.group(2)
+        match = _RANK_TIER_RE.search(rank_part)
+        if match:
+            return match.group(1), ''
+    return None
+
+
+def season_from_tooltip(tooltip_content):
+    """Parse (label, reached, finished) from a season tag's tooltip, or None if it is not one."""
+    if 'This player reached' not in tooltip_content or 'Ranked Solo/Duo' not in tooltip_content:
+        return None
+    match = _SEASON_TOOLTIP_RE.search(tooltip_content)
+    if not match:
+        return None
+    return match.group(2).strip(), match.group(1).strip(), match.group(3).strip()
+
+
+def last_season(history):
+    """(reached, finished) for the last finished season in a season history."""
+    reached, finished = history.get(last_season_label(), ('Unranked', 'Unranked'))
+    return reached, finished
+
+
+class _Capture:
+    __slots__ = ('parts', 'text')
+
+    def __init__(self):
+        self.parts = []
+        self.text = None
+
+
+class RankScanner(HTMLParser):
+    """Incremental single-pass scanner; feed() chunks, then close() and read result().
+
+    done() turns true as soon as every requested field is settled, so a
+    streaming caller can stop reading. A level taken before the end of the
+    page is the first level element seen, whereas a full scan applies the
+    LEVEL_SELECTORS priority order; likewise the season history is taken
+    from the element holding the first season tag once it closes.
+    """
+
+    def __init__(self, fields=ALL_FIELDS):
+        super().__init__(convert_charrefs=True)
+        self.fields = tuple(fields)
+        self.want_season = any(f in SEASON_FIELDS for f in self.fields)
+        self.in_body = False
+        self._stack = []            # [tag, captures opened by this element]
+        self._captures = []         # captures of currently open elements
+        self._raw_depth = 0
+        self._data = []
+        self.level_captures = [None] * len(LEVEL_SELECTORS)
+        self.fallback_level = ''
+        self.lp_state = None        # None -> looking for div, 'div' -> inside it, 'done'
+        self.lp_capture = None
+        self.meta_seen = False
+        self.tier = 'Unranked'
+        self.division = ''
+        self.season_history = {}
+        self._season_depth = None   # stack depth of the element holding the season tags
+        self.season_done = False
+
+    # -- string handling ---------------------------------------------------
+
+    def _flush_data(self):
+        if not self._data:
+            return
+        text = ''.join(self._data)
+        self._data = []
+        self._on_string(text, in_element_text=self._raw_depth == 0)
+
+    def _on_string(self, text, in_element_text):
+        if in_element_text:
+            for capture in self._captures:
+                capture.parts.append(text)
+        if not self.fallback_level and _LEVEL_TEXT_RE.search(text):
+            level_match = _LEVEL_FALLBACK_RE.search(text)
+            if level_match:
+                self.fallback_level = level_match.group(1) or level_match.group(2)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_comment(self, data):
+        self._flush_data()
+        self._on_string(data, in_element_text=False)
+
+    # -- tag handling ------------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_data()
+        attr_map = {k: ('' if v is None else v) for k, v in attrs}
+        opened = []
+
+        classes = attr_map.get('class')
+        if classes is not None:
+            for idx in _level_selector_matches(tag, classes):
+                if self.level_captures[idx] is None:
+                    self.level_captures[idx] = capture = _Capture()
+                    opened.append(capture)
+            if tag == 'div' and self.lp_state is None and 'league-points' in classes.split():
+                self.lp_state = 'div'
+                opened.append('lp_div')
+            elif (tag == 'span' and self.lp_state == 'div' and self.lp_capture is None
+                  and 'leaguePoints' in classes.split()):
+                self.lp_capture = capture = _Capture()
+                opened.append(capture)
+
+        if tag == 'meta' and not self.meta_seen and attr_map.get('name') == 'twitter:description':
+            self.meta_seen = True
+            desc = attr_map.get('content')
+            if desc is not None:
+                rank = rank_from_description(desc)
+                if rank:
+                    self.tier, self.division = rank
+
+        if tag == 'body':
+            self.in_body = True
+
+        if self.want_season and tag == 'div' and 'tooltip' in attr_map:
+            self._on_tooltip(html.unescape(attr_map['tooltip']))
+
+        if tag in _VOID_TAGS:
+            self._finish(opened)
+            return
+        self._stack.append((tag, opened))
+        self._captures.extend(c for c in opened if isinstance(c, _Capture))
+        if tag in _RAW_TEXT_TAGS:
+            self._raw_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush_data()
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > i:
+            self._pop()
+
+    def _pop(self):
+        tag, opened = self._stack.pop()
+        if tag in _RAW_TEXT_TAGS:
+            self._raw_depth -= 1
+        if self._season_depth is not None and len(self._stack) < self._season_depth:
+            self.season_done = True
+        if opened:
+            self._captures = [c for c in self._captures if c not in opened]
+            self._finish(opened)
+
+    def _finish(self, opened):
+        for capture in opened:
+            if capture == 'lp_div':
+                self.lp_state = 'done'
+            else:
+                capture.text = ''.join(capture.parts)
+                capture.parts = None
+
+    def _on_tooltip(self, tooltip_content):
+        season = season_from_tooltip(tooltip_content)
+        if season:
+            label, reached, finished = season
+            self.season_history.setdefault(label, [reached, finished])
+            if self._season_depth is None:
+                self._season_depth = len(self._stack)
+
+    def close(self):
+        super().close()
+        self._flush_data()
+        while self._stack:
+            self._pop()
+
+    # -- results -----------------------------------------------------------
+
+    def done(self):
+        """True once all requested fields are known and the rest of the page can be skipped."""
+        tier_done = self.meta_seen or self.in_body
+        if not tier_done:
+            return False
+        if 'lp' in self.fields and not self._lp_settled():
+            return False
+        if 'level' in self.fields:
+            if not any(c is not None and c.text is not None and level_from_text(c.text.strip())
+                       for c in self.level_captures):
+                return False
+        if self.want_season and not self.season_done:
+            return False
+        return True
+
+    def level(self):
+        for capture in self.level_captures:
+            if capture is not None:
+                text = capture.text if capture.text is not None else ''.join(capture.parts)
+                level = level_from_text(text.strip())
+                if level:
+                    return level
+        return self.fallback_level
+
+    def lp(self):
+        if self.lp_capture is None:
+            return ''
+        capture = self.lp_capture
+        text = capture.text if capture.text is not None else ''.join(capture.parts)
+        return text.strip()
+
+    def _lp_settled(self):
+        if self.lp_capture is not None:
+            return self.lp_capture.text is not None
+        if self.lp_state == 'done':
+            return True
+        # Unranked pages have no league points block to wait for
+        return self.tier.capitalize() == 'Unranked'
+
+    def result(self):
+        result = {
+            'tier': self.tier,
+            'division': self.division,
+            'lp': self.lp(),
+            'level': self.level(),
+        }
+        if self.want_season:
+            result['season_history'] = dict(self.season_history)
+            result['reached_last_season'], result['finished_last_season'] = last_season(self.season_history)
+        return {key: result[key] for key in self.fields}
+
+
+class FastExtractor:
+    name = 'fast'
+
+    def scanner(self, fields=ALL_FIELDS):
+        return RankScanner(fields)
+
+    def extract(self, page_html, fields=ALL_FIELDS):
+        scanner = self.scanner(fields)
+        scanner.feed(page_html)
+        scanner.close()
+        return scanner.result()
+
+
+EXTRACTORS = {
+    Bs4Extractor.name: Bs4Extractor,
+    FastExtractor.name: FastExtractor,
+}
+DEFAULT_EXTRACTOR = FastExtractor.name
+
+
+def get_extractor(name=DEFAULT_EXTRACTOR):
+    try:
+        return EXTRACTORS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown extractor backend: {name!r} (expected one of {', '.join(EXTRACTORS)})")
@@ -0,0 +1,290 @@
+"""
+App-wide rank fetch service.
+Runs every RankFetcher call on one bounded worker pool, with a cap on
+concurrent requests per host, instead of one thread per operation.
+Concurrent requests for the same summoner share one fetch (single-flight)
+and successful results are reused for a short window.
+Queued fetches run in priority order, so what the user is looking at is
+fetched before the rest of a bulk refresh.
+"""
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+from .utils import format_summoner_name
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST_LIMIT = 6
+# Per-host slots kept back from queued fetches for hedged backup requests
+DEFAULT_HEDGE_RESERVE = 1
+DEFAULT_RUN_TIMEOUT = 300.0
+DEFAULT_MEMO_TTL = 10.0     # seconds a successful result is reused
+
+# Fetch priorities, lower runs sooner
+PRIORITY_INTERACTIVE = 0    # the user asked for this account right now
+PRIORITY_SELECTED = 1       # selected row
+PRIORITY_VISIBLE = 2        # row on screen
+PRIORITY_SEARCH = 3         # row matching the current search
+PRIORITY_BULK = 4           # rest of a refresh run
+PRIORITY_BACKGROUND = 5     # scheduled refreshes nobody is waiting for
+
+
+class _Job:
+    """A queued call. It may sit in the queue under several priorities; the first pop runs it."""
+
+    def __init__(self, priority, fn, *args):
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.future = Future()
+        self.taken = False
+
+
+class FetchService:
+    def __init__(self, rank_fetcher, max_workers=DEFAULT_MAX_WORKERS,
+                 per_host_limit=DEFAULT_PER_HOST_LIMIT, memo_ttl=DEFAULT_MEMO_TTL, hedge_reserve=0):
+        self.rank_fetcher = rank_fetcher
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        # Of per_host_limit, queued fetches use the rest and hedged backups these
+        self.hedge_reserve = max(0, min(hedge_reserve, per_host_limit - 1))
+        self.memo_ttl = memo_ttl
+        # (priority, sequence, job); the sequence keeps equal priorities first-in first-out
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers = []
+        self._closed = False
+        self._host_slots = {}
+        self._hedge_slots = {}
+        # Reentrant: a fetch that is already done runs its callback while the lock is held
+        self._lock = threading.RLock()
+        # (key, current_only) -> _Job of the fetch queued or in flight
+        self._in_flight = {}
+        # key -> (time.monotonic(), current_only, rank_info)
+        self._memo = {}
+        self.fetches = 0
+        self.coalesced = 0
+        self.memo_hits = 0
+
+    def _enqueue(self, priority, fn, *args):
+        """Queue fn(*args) as a job. Lock held."""
+        if self._closed:
+            raise RuntimeError('cannot schedule new fetches after shutdown')
+        job = _Job(priority, fn, *args)
+        self._queue.put((priority, next(self._sequence), job))
+        if len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, daemon=True,
+                                      name=f'rank-fetch-{len(self._workers)}')
+            self._workers.append(worker)
+            worker.start()
+        return job
+
+    def _bump(self, job, priority):
+        """Move a queued job up to priority. Lock held. Returns True if it moved."""
+        if job.taken or priority >= job.priority:
+            return False
+        # The old queue entry stays behind and is skipped when popped
+        job.priority = priority
+        self._queue.put((priority, next(self._sequence), job))
+        return True
+
+    def _work(self):
+        while True:
+            priority, _, job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                if job.taken or priority != job.priority:
+                    continue
+                job.taken = True
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = job.fn(*job.args)
+            except BaseException as e:
+                job.future.set_exception(e)
+            else:
+                job.future.set_result(result)
+
+    def _slot(self, slots, host, size):
+        with self._lock:
+            slot = slots.get(host)
+            if slot is None:
+                slot = slots[host] = threading.BoundedSemaphore(size)
+            return slot
+
+    def host_slot(self, host):
+        """Semaphore capping the queued fetches running against host."""
+        return self._slot(self._host_slots, host, self.per_host_limit - self.hedge_reserve)
+
+    def hedge_slot(self, host):
+        """Semaphore for hedged backups to host, which a bulk refresh's fetches cannot fill up."""
+        return self._slot(self._hedge_slots, host, self.hedge_reserve)
+
+    def _run(self, account, current_only, deadline, record):
+        host = urlparse(self.rank_fetcher.summoner_url(account)).netloc
+        with self.host_slot(host):
+            return self.rank_fetcher.fetch_rank(account, current_only=current_only,
+                                                deadline=deadline, record=record)
+
+    @staticmethod
+    def fetch_key(account):
+        """Requests with the same key are for the same summoner page."""
+        return account.region, format_summoner_name(account.name).lower()
+
+    def _shared_fetch(self, key, account, current_only, deadline, record, priority):
+        """Return (future, shared). Must be called with the lock held."""
+        # A full fetch also answers a current-only request, not the other way round
+        for wanted in ((False, True) if current_only else (False,)):
+            job = self._in_flight.get((key, wanted))
+            if job is not None:
+                self.coalesced += 1
+                self._bump(job, priority)
+                return job.future, True
+        job = self._enqueue(priority, self._run, account, current_only, deadline, record)
+        self._in_flight[(key, current_only)] = job
+        self.fetches += 1
+        job.future.add_done_callback(lambda f: self._fetch_done(key, current_only, job))
+        return job.future, False
+
+    def _fetch_done(self, key, current_only, job):
+        future = job.future
+        with self._lock:
+            if self._in_flight.get((key, current_only)) is job:
+                del self._in_flight[(key, current_only)]
+            if future.cancelled() or future.exception() is not None or future.result().get('error'):
+                return
+            now = time.monotonic()
+            memo = self._memo.get(key)
+            if memo is None or not current_only or memo[1]:
+                self._memo[key] = (now, current_only, future.result())
+            # Drop expired entries so the memo stays small
+            for stale in [k for k, (at, _, _) in self._memo.items() if now - at > self.memo_ttl]:
+                del self._memo[stale]
+
+    def _memoized(self, key, current_only):
+        """Fresh successful result for key, if one covers the requested fields. Lock held."""
+        memo = self._memo.get(key)
+        if memo is None or time.monotonic() - memo[0] > self.memo_ttl:
+            return None
+        if memo[1] and not current_only:
+            return None
+        return memo[2]
+
+    @staticmethod
+    def _relay(source, target, record, how):
+        """Complete a caller's own future from a shared fetch, with its own copy of the result."""
+        def relay(f):
+            if target.cancelled():
+                return
+            if f.cancelled():
+                target.cancel()
+            elif f.exception() is not None:
+                target.set_exception(f.exception())
+            else:
+                rank_info = dict(f.result())
+                if record is not None and how is not None:
+                    record.cache = how
+                    record.start()
+                    record.finish(rank_info)
+                target.set_result(rank_info)
+        source.add_done_callback(relay)
+
+    def submit(self, account, callback=None, current_only=False, deadline=None, record=None,
+               priority=PRIORITY_BULK):
+        """Queue a rank fetch. Returns a Future resolving to the rank info dict.
+
+        If the same summoner is already being fetched the caller shares that
+        fetch, and a successful result from the last memo_ttl seconds is
+        returned without fetching again. Every caller gets its own copy.
+
+        If given, callback(account, rank_info) runs once the fetch completes,
+        on the worker thread (or the calling thread for a reused result);
+        GUI callers must hop back to Tk with root.after.
+        deadline is an absolute time.monotonic() value shared by a whole run.
+        record is an instrumentation FetchRecord to fill in; its queue time
+        starts when it was created.
+        Queued fetches start in priority order (PRIORITY_*); joining a queued
+        fetch at a more urgent priority moves it up.
+        """
+        key = self.fetch_key(account)
+        future = Future()
+        with self._lock:
+            rank_info = self._memoized(key, current_only)
+            if rank_info is not None:
+                self.memo_hits += 1
+                done = Future()
+                done.set_result(rank_info)
+                self._relay(done, future, record, 'memo')
+            else:
+                shared, joined = self._shared_fetch(key, account, current_only, deadline, record, priority)
+                self._relay(shared, future, record, 'coalesced' if joined else None)
+        if callback is not None:
+            def done(f):
+                if not f.cancelled():
+                    callback(account, f.result())
+            future.add_done_callback(done)
+        return future
+
+    def submit_many(self, accounts, callback=None, current_only=False, timeout=DEFAULT_RUN_TIMEOUT,
+                    report=None, priority=PRIORITY_BULK):
+        """Queue a refresh run; accounts not fetched within timeout seconds fail with 'deadline'.
+
+        If a RunReport is given, every fetch gets a record in it.
+        priority is a PRIORITY_* value or a function of the account returning one.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        priority_of = priority if callable(priority) else (lambda acc: priority)
+        return [self.submit(acc, callback, current_only, deadline,
+                            report.new_record(acc) if report is not None else None,
+                            priority_of(acc))
+                for acc in accounts]
+
+    def reprioritize(self, accounts, priority):
+        """Move queued fetches for accounts up to priority. Returns how many moved.
+
+        Fetches already running, or queued at a more urgent priority, are left alone.
+        """
+        moved = 0
+        with self._lock:
+            for acc in accounts:
+                key = self.fetch_key(acc)
+                for current_only in (False, True):
+                    job = self._in_flight.get((key, current_only))
+                    if job is not None and self._bump(job, priority):
+                        moved += 1
+        return moved
+
+    def stats(self):
+        with self._lock:
+            return {'fetches': self.fetches, 'coalesced': self.coalesced, 'memo_hits': self.memo_hits,
+                    'in_flight': len(self._in_flight), 'queued': self._queue.qsize()}
+
+    def prewarm(self):
+        """Warm the fetcher's connection pool in the background."""
+        with self._lock:
+            return self._enqueue(PRIORITY_INTERACTIVE, self.rank_fetcher.prewarm).future
+
+    def shutdown(self, wait=False):
+        """Cancel queued fetches and stop the workers once their current fetch ends."""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        pending = []
+        while True:
+            try:
+                pending.append(self._queue.get_nowait()[2])
+            except queue.Empty:
+                break
+        for job in pending:
+            job.future.cancel()
+        for _ in workers:
+            # Sentinels sort ahead of any job still being queued by a racing submit
+            self._queue.put((-1, next(self._sequence), None))
+        if wait:
+            for worker in workers:
+                worker.join()
+        self.rank_fetcher.close()
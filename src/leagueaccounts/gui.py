@@ -2,6 +2,7 @@ import json
 import tkinter as tk
 from tkinter import ttk, messagebox
 import tkinter.font as tkfont
+import math
 import threading
 import customtkinter as ctk
 
@@ -25,8 +26,16 @@ from pathlib import Path
 import sys
 
 from .account_manager import AccountManager, KEYRING_SERVICE
-from . import windows_credential as cred
 from .rank_fetcher import RankFetcher
+from .rank_sources import HedgedRankSource
+from .lcu_source import LcuRankSource
+from .rate_limiter import RateLimiter
+from .fetch_service import (FetchService, DEFAULT_PER_HOST_LIMIT, DEFAULT_HEDGE_RESERVE, PRIORITY_INTERACTIVE, PRIORITY_SELECTED,
+                            PRIORITY_VISIBLE, PRIORITY_SEARCH, PRIORITY_BULK)
+from .response_cache import ResponseCache
+from .parse_pool import ParsePool
+from .instrumentation import RunReport
+from .scheduler import RefreshScheduler
 from .utils import REGION_DISPLAY_NAMES, TIER_ORDER, REGION_MAP
 from .models import Account
 
@@ -58,6 +67,9 @@ COLORS = {
     'tree_heading': '#3d3d3d',
 }
 
+# Scrolling and selection are coalesced for this long (ms) before queued fetches are reordered
+VIEW_CHANGE_DELAY_MS = 150
+
 class LeagueAccountApp:
     def __init__(self):
         self.root = ctk.CTk()
@@ -65,13 +77,38 @@ class LeagueAccountApp:
         # Set window icon
         if WINDOW_ICON_PATH.exists():
             self.root.iconbitmap(str(WINDOW_ICON_PATH))
-        self.manager = AccountManager(self.root, RankFetcher())
+        self.response_cache = ResponseCache()
+        self.parse_pool = ParsePool()
+        rate_limiter = RateLimiter()
+        primary = RankFetcher(pool_maxsize=DEFAULT_PER_HOST_LIMIT, cache=self.response_cache,
+                              rate_limiter=rate_limiter, parse_pool=self.parse_pool)
+        # Backup for slow lookups: a separate connection pool to the same site
+        # (so a stalled connection is sidestepped) sharing the same rate limit
+        # and circuit breaker, since it is the same site going up or down
+        backup = RankFetcher(pool_maxsize=2, cache=self.response_cache, rate_limiter=rate_limiter,
+                             breaker=primary.breaker, parse_pool=self.parse_pool)
+        hedged = HedgedRankSource(primary, backup)
+        # The signed-in account is read from the running client when possible
+        rank_source = LcuRankSource(fallback=hedged)
+        self.fetch_service = FetchService(rank_source, hedge_reserve=DEFAULT_HEDGE_RESERVE)
+        # Backups use the per-host slots held back from queued fetches, so a bulk refresh cannot starve them
+        hedged.hedge_slot = self.fetch_service.hedge_slot
+        # Open the connection to the rank site while the window is being built
+        self.fetch_service.prewarm()
+        self.manager = AccountManager(self.root, rank_source, self.fetch_service)
         self.gui = LeagueAccountManagerGUI(self.root, self.manager)
         # Maximize after GUI is set up
         self.root.after(50, lambda: self.root.state('zoomed'))
 
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.gui.scheduler.stop()
+            self.manager.close()
+            self.fetch_service.shutdown()
+            self.parse_pool.shutdown()
+            self.response_cache.flush()
 
 class LeagueAccountManagerGUI:
     def __init__(self, root, manager):
@@ -80,6 +117,9 @@ class LeagueAccountManagerGUI:
         self._img_refs = []
         self._copy_counter = 0
         self._last_selected_item = None
+        self._refresh_notices = set()
+        self._view_change_pending = False
+        self.scheduler = RefreshScheduler(root, manager, self._apply_background_rank)
         self.setup_gui()
         # Defer account loading to after GUI is ready
         self.root.after(100, self._delayed_init)
@@ -88,6 +128,7 @@ class LeagueAccountManagerGUI:
         """Initialize heavy operations after GUI is ready"""
         self.manager.load_accounts()
         self.display_accounts(self.manager.accounts)
+        self.scheduler.start()
 
     def setup_gui(self):
         # Configure dark theme for ttk.Treeview
@@ -166,6 +207,10 @@ class LeagueAccountManagerGUI:
                                             command=self.refresh_all_ranks, width=140)
         self.refresh_button.pack(pady=5)
 
+        self.full_refresh_button = ctk.CTkButton(self.action_frame, text='Full Refresh',
+                                                 command=lambda: self.refresh_all_ranks(full=True), width=140)
+        self.full_refresh_button.pack(pady=5)
+
         self.export_button = ctk.CTkButton(self.action_frame, text='Export Data',
                                             command=self.export_data, width=140)
         self.export_button.pack(pady=5)
@@ -178,6 +223,12 @@ class LeagueAccountManagerGUI:
                                          command=self.show_shortcuts_help, width=140)
         self.help_button.pack(pady=5)
 
+        self.background_refresh_var = tk.BooleanVar(value=self.scheduler.enabled)
+        self.background_refresh_check = ctk.CTkCheckBox(
+            self.action_frame, text='Auto Refresh', variable=self.background_refresh_var,
+            command=lambda: self.scheduler.set_enabled(self.background_refresh_var.get()))
+        self.background_refresh_check.pack(pady=5)
+
         # Treeview container - pack AFTER actions so it fills remaining space
         tree_container = ctk.CTkFrame(tree_row, fg_color='transparent')
         tree_container.pack(side='left', fill='both', expand=True)
@@ -197,12 +248,28 @@ class LeagueAccountManagerGUI:
         self.tree.pack(side='left', fill='both', expand=True)
         self.tree.bind('<Control-c>', self.on_tree_ctrl_c)
         self.tree.bind('<Control-Shift-V>', self.on_tree_ctrl_shift_v)
+        self.tree.tag_configure('refreshing', background='#4a4a4a')
 
         # Custom scrollbar for treeview
         scrollbar = ctk.CTkScrollbar(tree_container, command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
+
+        def on_tree_scroll(first, last):
+            scrollbar.set(first, last)
+            self._on_view_change()
+        self.tree.configure(yscroll=on_tree_scroll)
         scrollbar.pack(side='right', fill='y')
 
+        # Right-click menu for a single row
+        self.tree_menu = tk.Menu(self.tree, tearoff=0, bg=COLORS['bg_card'], fg=COLORS['text_primary'],
+                                 activebackground=COLORS['tree_selected'],
+                                 activeforeground=COLORS['text_primary'])
+        self.tree_menu.add_command(label='Refresh This Account', command=self.refresh_selected_account)
+        self.tree_menu.add_command(label='Copy Account ID', command=self.copy_selected_account_id)
+        self.tree_menu.add_command(label='Copy Password', command=self.copy_selected_password)
+        self.tree_menu.add_command(label='Season History', command=self.show_season_history)
+        self.tree_menu.add_separator()
+        self.tree_menu.add_command(label='Delete Account', command=self.delete_selected_account)
+
         # Add New Account section
         self.form_frame = ctk.CTkFrame(main_container, fg_color=COLORS['bg_card'], corner_radius=10)
         self.form_frame.pack(padx=0, pady=(0, 15), fill='x')
@@ -336,6 +403,9 @@ class LeagueAccountManagerGUI:
         # Bind tree events
         self.tree.bind('<Double-1>', self.on_tree_double_click)
         self.tree.bind('<Delete>', lambda event: self.delete_selected_account())
+        self.tree.bind('<F5>', lambda event: self.refresh_selected_account())
+        self.tree.bind('<Button-3>', self.on_tree_right_click)
+        self.tree.bind('<<TreeviewSelect>>', self._on_view_change)
 
     def add_account(self):
         _lazy_imports()
@@ -353,14 +423,13 @@ class LeagueAccountManagerGUI:
         if not region:
             messagebox.showerror('Input Error', 'Invalid region selected.')
             return
-        for acc in self.manager.accounts:
-            if acc.account_id.lower() == account_id.lower() and acc.region == region:
-                messagebox.showerror('Duplicate', 'This account is already added.')
-                return
+        if self.manager.contains(region, account_id):
+            messagebox.showerror('Duplicate', 'This account is already added.')
+            return
 
         try:
             _lazy_imports()
-            cred.set_password(KEYRING_SERVICE, f'{region}:{account_id}', password)
+            self.manager.credentials.set_password(KEYRING_SERVICE, f'{region}:{account_id}', password)
 
             new_acc = Account(
                 account_id=account_id,
@@ -382,23 +451,8 @@ class LeagueAccountManagerGUI:
                                f'3. Try running as administrator')
             return
 
-        # Fetch rank information for the new account
-        def fetch_rank_worker():
-            try:
-                rank_info = self.manager.rank_fetcher.fetch_rank(new_acc)
-                new_acc.tier = rank_info.get('tier', 'Unranked')
-                new_acc.division = rank_info.get('division', '')
-                new_acc.lp = rank_info.get('lp', '')
-                new_acc.level = rank_info.get('level', '')
-                new_acc.reached_last_season = rank_info.get('reached_last_season', 'N/A')
-                new_acc.finished_last_season = rank_info.get('finished_last_season', 'N/A')
-                self.manager.save_accounts()
-                # Update the display in the main thread
-                self.root.after(0, lambda: self.display_accounts(self.manager.accounts))
-            except Exception as e:
-                print(f"Error fetching rank for {account_id}: {e}")
-
-        threading.Thread(target=fetch_rank_worker, daemon=True).start()
+        # Fetch rank information for the new account on the shared fetch pool
+        self.manager.fetch_service.submit(new_acc, callback=self._on_new_account_rank)
 
         # Display accounts immediately (with placeholder rank info)
         self.display_accounts(self.manager.accounts)
@@ -465,13 +519,13 @@ class LeagueAccountManagerGUI:
                     continue
 
                 # Check for duplicates
-                if any(acc.account_id.lower() == account_id.lower() and acc.region == region for acc in self.manager.accounts):
+                if self.manager.contains(region, account_id):
                     error_count += 1
                     self.root.after(0, lambda: self._remove_line_from_multiadd(0))
                     continue
 
                 try:
-                    cred.set_password(KEYRING_SERVICE, f'{region}:{account_id}', password)
+                    self.manager.credentials.set_password(KEYRING_SERVICE, f'{region}:{account_id}', password)
                     new_acc = Account(
                         account_id=account_id,
                         name=name,
@@ -482,21 +536,14 @@ class LeagueAccountManagerGUI:
                     )
                     self.manager.add_account(new_acc)
 
-                    # Fetch rank information
-                    rank_info = self.manager.rank_fetcher.fetch_rank(new_acc)
-                    new_acc.tier = rank_info.get('tier', 'Unranked')
-                    new_acc.division = rank_info.get('division', '')
-                    new_acc.lp = rank_info.get('lp', '')
-                    new_acc.level = rank_info.get('level', '')
-                    new_acc.reached_last_season = rank_info.get('reached_last_season', 'N/A')
-                    new_acc.finished_last_season = rank_info.get('finished_last_season', 'N/A')
+                    # Queue rank fetch; the pool applies it when done
+                    self.manager.fetch_service.submit(new_acc, callback=self._on_new_account_rank)
 
                     processed_count += 1
 
                     # Remove the processed line and update display
                     self.root.after(0, lambda: self._remove_line_from_multiadd(0))
                     self.root.after(0, lambda: self.display_accounts(self.manager.accounts))
-                    self.manager.save_accounts()
 
                 except Exception as e:
                     # Log error information
@@ -512,6 +559,17 @@ class LeagueAccountManagerGUI:
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def _on_new_account_rank(self, acc, rank_info):
+        """Fetch-pool callback for newly added accounts; applies the result on the Tk thread."""
+        def apply():
+            self.manager.apply_rank_info(acc, rank_info)
+            try:
+                self.manager.save_accounts()
+            except Exception as e:
+                print(f"Error saving rank for {acc.account_id}: {e}")
+            self.display_accounts(self.manager.accounts)
+        self.root.after(0, apply)
+
     def _remove_line_from_multiadd(self, idx):
         lines = self.multiadd_text.get('1.0', tk.END).splitlines()
         if 0 <= idx < len(lines):
@@ -542,7 +600,7 @@ class LeagueAccountManagerGUI:
                 lp = '...'
             if not level:
                 level = '...'
-            self.tree.insert('', 'end', values=(
+            self.tree.insert('', 'end', iid=self._row_id(acc), values=(
                 acc.account_id,
                 acc.name,
                 acc.region_display,
@@ -574,8 +632,8 @@ class LeagueAccountManagerGUI:
         if not search:
             self.display_accounts(self.manager.accounts)
             return
-        filtered = [acc for acc in self.manager.accounts if search in acc.name.lower() or search in acc.account_id.lower()]
-        self.display_accounts(filtered)
+        self.display_accounts(self.manager.search_accounts(search))
+        self._on_view_change()
 
     def copy_selected_account_id(self):
         _lazy_imports()
@@ -591,23 +649,12 @@ class LeagueAccountManagerGUI:
 
     def _find_account(self, account_id, region_display):
         """Find an account in memory by account_id and region_display."""
-        region = REGION_MAP.get(region_display, region_display)
-        for acc in self.manager.accounts:
-            if acc.account_id == account_id and acc.region in (region, region_display):
-                return acc
-        return None
+        return self.manager.get(region_display, account_id)
 
-    def _get_password(self, account_id, region_display):
-        """Get password from in-memory account, falling back to credential store."""
+    def _get_password(self, account_id, region_display, cache=True):
+        """Read an account's password on demand (see AccountManager.get_password)."""
         acc = self._find_account(account_id, region_display)
-        if acc and acc.password:
-            return acc.password
-        # Fallback to credential store if in-memory password is empty
-        region = REGION_MAP.get(region_display, region_display)
-        try:
-            return cred.get_password(KEYRING_SERVICE, f'{region}:{account_id}') or ''
-        except Exception:
-            return ''
+        return self.manager.get_password(acc, cache) if acc else ''
 
     def copy_selected_password(self):
         _lazy_imports()
@@ -624,43 +671,193 @@ class LeagueAccountManagerGUI:
         if password:
             pyperclip.copy(password)
 
-    def refresh_all_ranks(self):
+    def _row_id(self, acc):
+        """Treeview item id of an account's row: its index key as 'region:account_id'."""
+        return '{}:{}'.format(*self.manager.account_key(acc.region, acc.account_id))
+
+    def _row_account(self, item):
+        """The account displayed in a Treeview row, if it still exists."""
+        region, _, account_id = item.partition(':')
+        return self.manager.get(region, account_id)
+
+    def _find_row(self, acc):
+        """Find the Treeview row displaying this account, if any."""
+        item = self._row_id(acc)
+        return item if self.tree.exists(item) else None
+
+    def _rows_in_view(self):
+        """Treeview rows currently scrolled into view."""
+        rows = self.tree.get_children()
+        if not rows:
+            return ()
+        first, last = self.tree.yview()
+        return rows[int(first * len(rows)):math.ceil(last * len(rows))]
+
+    def _view_priorities(self):
+        """Fetch priority of each account the user is looking at, keyed by row id."""
+        priorities = {}
+        if self.search_var.get().strip():
+            # While searching, only matching accounts are displayed
+            for item in self.tree.get_children():
+                priorities[item] = PRIORITY_SEARCH
+        for rows, priority in ((self._rows_in_view(), PRIORITY_VISIBLE),
+                               (self.tree.selection(), PRIORITY_SELECTED)):
+            for item in rows:
+                priorities[item] = priority
+        return priorities
+
+    def _on_view_change(self, event=None):
+        """Selection, scroll position or search changed; reorder queued fetches shortly."""
+        if self._view_change_pending:
+            return
+        self._view_change_pending = True
+        self.root.after(VIEW_CHANGE_DELAY_MS, self._reprioritize_view)
+
+    def _reprioritize_view(self):
+        self._view_change_pending = False
+        by_priority = {}
+        for item, priority in self._view_priorities().items():
+            acc = self._row_account(item)
+            if acc is not None:
+                by_priority.setdefault(priority, []).append(acc)
+        for priority, accs in by_priority.items():
+            self.manager.fetch_service.reprioritize(accs, priority)
+
+    def refresh_all_ranks(self, current_only=False, full=False):
+        """Refresh accounts whose data is out of date, or every account if full is set.
+
+        The selected row, then rows on screen, then search matches are fetched
+        before the rest; scrolling or selecting during the run moves those up.
+        """
+        self._refresh_notices.clear()
+        accounts = list(self.manager.accounts) if full else self.manager.stale_accounts()
+        if not accounts:
+            if not full and self.manager.accounts:
+                messagebox.showinfo('Refresh Ranks', 'All accounts are up to date.\n\n'
+                                    'Use Full Refresh to fetch every account anyway.')
+            return
+        # Highlight every row that is about to be refreshed in grey
+        for acc in accounts:
+            item = self._find_row(acc)
+            if item:
+                self.tree.item(item, tags=('refreshing',))
+
+        report = RunReport('full refresh' if full else 'refresh')
+        pending = [len(accounts)]
+        view = self._view_priorities()
+
+        def on_fetched(acc, rank_info):
+            self.root.after(0, lambda: self._apply_refreshed_rank(acc, rank_info, report, pending))
+
+        self.manager.fetch_service.submit_many(
+            accounts, callback=on_fetched, current_only=current_only, report=report,
+            priority=lambda acc: view.get(self._row_id(acc), PRIORITY_BULK))
+
+    def refresh_selected_account(self):
+        """Refresh the selected account ahead of any refresh run in progress."""
+        selected = self.tree.selection()
+        if not selected:
+            return
+        acc = self._row_account(selected[0])
+        if acc is None:
+            return
+        self.tree.item(selected[0], tags=('refreshing',))
+        report = RunReport('account refresh')
+        pending = [1]
+
+        def on_fetched(acc, rank_info):
+            self.root.after(0, lambda: self._apply_refreshed_rank(acc, rank_info, report, pending))
+
+        self.manager.fetch_service.submit(acc, callback=on_fetched, record=report.new_record(acc),
+                                          priority=PRIORITY_INTERACTIVE)
+
+    def show_season_history(self):
+        selected = self.tree.selection()
+        if not selected:
+            return
+        acc = self._row_account(selected[0])
+        if acc is None:
+            return
+        lines = []
+        for label in reversed(acc.seasons()):
+            reached, finished = acc.season_rank(label)
+            lines.append(f'{label}: reached {reached}, finished {finished}')
+        messagebox.showinfo(f'Season History - {acc.name}',
+                            '\n'.join(lines) if lines else 'No ranked seasons found yet. Refresh to load them.')
+
+    def on_tree_right_click(self, event):
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return
+        self.tree.selection_set(item)
+        self.tree.focus(item)
+        try:
+            self.tree_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            self.tree_menu.grab_release()
+
+    def _apply_refreshed_rank(self, acc, rank_info, report, pending):
+        self._notify_refresh_error(rank_info.get('error'))
+        # apply_rank_info schedules its own write; the run's last result flushes it
+        self.manager.apply_rank_info(acc, rank_info)
+        self._update_row(acc)
+        pending[0] -= 1
+        if pending[0] == 0:
+            self._finish_refresh_report(report)
+
+    def _apply_background_rank(self, acc, rank_info):
+        """Scheduler callback: apply a background result quietly, without error popups."""
+        if not self.manager.apply_rank_info(acc, rank_info):
+            return
+        try:
+            self.manager.save_accounts()
+        except Exception as e:
+            print(f"Error saving rank for {acc.account_id}: {e}")
+        self._update_row(acc)
+
+    def _update_row(self, acc):
+        """Show an account's current rank info in its row, if displayed."""
+        item = self._find_row(acc)
+        if item:
+            new_values = list(self.tree.item(item, 'values'))
+            new_values[3] = acc.level or '...'
+            new_values[4] = acc.tier or '...'
+            new_values[5] = acc.division or '...'
+            new_values[6] = acc.lp or '...'
+            new_values[7] = acc.reached_last_season or 'N/A'
+            new_values[8] = acc.finished_last_season or 'N/A'
+            # Remove highlight after update
+            self.tree.item(item, values=new_values, tags=())
+
+    def _finish_refresh_report(self, report):
+        report.finish()
+
+        # The summary is in the report file; flushing and writing it stay off the Tk thread
         def worker():
-            for idx, acc in enumerate(self.manager.accounts):
-                # Find the row in the tree corresponding to this account
-                for item in self.tree.get_children():
-                    values = self.tree.item(item, 'values')
-                    if values and values[0] == acc.account_id and values[2] == acc.region_display:
-                        # Highlight the row in grey
-                        self.root.after(0, lambda item=item: self.tree.item(item, tags=('refreshing',)))
-                        self.root.after(0, lambda: self.tree.tag_configure('refreshing', background='#4a4a4a'))
-                        break
-                # Fetch new rank info
-                rank_info = self.manager.rank_fetcher.fetch_rank(acc)
-                acc.tier = rank_info.get('tier', 'Unranked')
-                acc.division = rank_info.get('division', '')
-                acc.lp = rank_info.get('lp', '')
-                acc.level = rank_info.get('level', '')
-                acc.reached_last_season = rank_info.get('reached_last_season', 'N/A')
-                acc.finished_last_season = rank_info.get('finished_last_season', 'N/A')
-                self.manager.save_accounts()
-                # Update the row in the tree with new rank info
-                for item in self.tree.get_children():
-                    values = self.tree.item(item, 'values')
-                    if values and values[0] == acc.account_id and values[2] == acc.region_display:
-                        new_values = list(values)
-                        new_values[3] = acc.level or '...'
-                        new_values[4] = acc.tier or '...'
-                        new_values[5] = acc.division or '...'
-                        new_values[6] = acc.lp or '...'
-                        new_values[7] = acc.reached_last_season or 'N/A'
-                        new_values[8] = acc.finished_last_season or 'N/A'
-                        self.root.after(0, lambda item=item, vals=new_values: self.tree.item(item, values=vals))
-                        # Remove highlight after update
-                        self.root.after(0, lambda item=item: self.tree.item(item, tags=()))
-                        break
+            report.record_save(self.manager.writer)
+            try:
+                report.write()
+            except Exception as e:
+                print(f"Could not write refresh report: {e}")
         threading.Thread(target=worker, daemon=True).start()
 
+    def _notify_refresh_error(self, kind):
+        """Tell the user once per refresh run when the rank source is down or the run timed out."""
+        if kind not in ('unavailable', 'deadline') or kind in self._refresh_notices:
+            return
+        self._refresh_notices.add(kind)
+        if kind == 'unavailable':
+            messagebox.showwarning('Source Unavailable',
+                                   'The rank source is not responding.\n\n'
+                                   'Remaining accounts keep their previous ranks '
+                                   '(accounts never fetched show Error). '
+                                   'Try refreshing again in a minute.')
+        else:
+            messagebox.showwarning('Refresh Timed Out',
+                                   'The refresh took too long and was stopped.\n\n'
+                                   'Accounts that were not reached keep their previous ranks '
+                                   '(accounts never fetched show Error).')
+
     def delete_selected_account(self):
         selected = self.tree.selection()
         if not selected:
@@ -709,16 +906,12 @@ class LeagueAccountManagerGUI:
             entry.destroy()
             values[col_num] = new_value
             self.tree.item(row_id, values=values)
-            account_id = values[0]
-            region_display = values[2]
-            for acc in self.manager.accounts:
-                if acc.account_id == account_id and acc.region_display == region_display:
-                    if col_num == 1:
-                        acc.name = new_value
-                    elif col_num == 9:
-                        acc.description = new_value
-                    break
-            self.manager.save_accounts()
+            acc = self._row_account(row_id)
+            if acc is not None:
+                if col_num == 1:
+                    self.manager.update_account(acc, name=new_value)
+                elif col_num == 9:
+                    self.manager.update_account(acc, description=new_value)
         entry.bind('<Return>', save_edit)
         entry.bind('<FocusOut>', save_edit)
 
@@ -728,8 +921,12 @@ class LeagueAccountManagerGUI:
         if tier == 'Show All' or not tier:
             self.display_accounts(self.manager.accounts)
             return
-        filtered = [acc for acc in self.manager.accounts if self.can_play_with(acc, tier, division)]
-        self.display_accounts(filtered)
+        # Compatible accounts are at most two tiers away; the store narrows the candidates
+        idx = TIER_ORDER.index(tier.capitalize())
+        lowest = TIER_ORDER[min(idx + 2, TIER_ORDER.index('Iron'))]
+        highest = TIER_ORDER[max(idx - 2, 0)]
+        candidates = self.manager.accounts_by_rank(lowest, highest)
+        self.display_accounts([acc for acc in candidates if self.can_play_with(acc, tier, division)])
 
     def can_play_with(self, acc, friend_tier, friend_division):
         def division_to_int(division):
@@ -881,7 +1078,8 @@ class LeagueAccountManagerGUI:
             return
         account_id = values[0]
         region_display = values[2]
-        password = self._get_password(account_id, region_display)
+        # Typed once, so not worth keeping around
+        password = self._get_password(account_id, region_display, cache=False)
         self.root.after(100, lambda: self._do_autotype(account_id, password))
 
     def _do_autotype(self, account_id, password):
@@ -948,16 +1146,19 @@ class LeagueAccountManagerGUI:
             "- Ctrl+C: Copy Account ID (press again to copy Password)\n"
             "- Ctrl+Shift+V: Auto-type Account ID and Password into another window\n"
             "- Delete: Delete selected account\n"
+            "- F5 or right-click > Refresh This Account: Refresh the selected account now\n"
             "- Double-click Summoner Name or Description: Edit in place\n"
             "- Enter (on Add Account button): Add new account\n"
             "\n"
             "Other Tips:\n"
             "- Use the search bar to filter accounts by name or ID.\n"
+            "- During a refresh, selected and on-screen accounts are fetched first.\n"
             "- Use the Friend Elo filter to show compatible accounts.\n"
+            "- Auto Refresh keeps ranks current in the background, one account at a time.\n"
         )
         win = ctk.CTkToplevel(self.root)
         win.title('Shortcuts Help')
-        win.geometry('450x300')
+        win.geometry('450x360')
         win.resizable(False, False)
 
         text = ctk.CTkTextbox(win, wrap='word', fg_color=COLORS['bg_card'],
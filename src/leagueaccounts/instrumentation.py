@@ -0,0 +1,207 @@
+"""
+Timing instrumentation for rank fetches.
+Each fetch fills a FetchRecord with per-phase timings, bytes received and
+how it ended; a RunReport collects the records of one refresh run and
+summarises them with latency percentiles.
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from .utils import get_refresh_report_file
+
+# Phases in pipeline order. 'request' is send + time to the response headers
+# (DNS and connect included: requests does not expose them separately).
+# Saving is not per fetch: the roster is written once per run (RunReport.record_save).
+PHASES = ('queue', 'wait', 'request', 'download', 'parse')
+PERCENTILES = (50, 95, 99)
+# Tiers shown without a division
+APEX_TIERS = ('Master', 'Grandmaster', 'Challenger')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def classify_result(rank_info):
+    """Return (outcome, missing_fields) for a rank info dict.
+
+    outcome is 'ok', 'missing_field' when the page parsed but some value
+    was not found, 'parse_miss' when nothing on the page was recognised,
+    or the result's error kind.
+    """
+    if rank_info.get('error'):
+        return rank_info['error'], []
+    missing = []
+    if 'level' in rank_info and not rank_info['level']:
+        missing.append('level')
+    tier = (rank_info.get('tier') or '').capitalize()
+    ranked = tier not in ('', 'Unranked')
+    if ranked:
+        expected = ('lp',) if tier in APEX_TIERS else ('division', 'lp')
+        missing.extend(key for key in expected if key in rank_info and not rank_info[key])
+    if 'level' in missing and 'tier' in rank_info and not ranked:
+        return 'parse_miss', missing
+    return ('missing_field' if missing else 'ok'), missing
+
+
+class FetchRecord:
+    def __init__(self, account):
+        self.account = f'{account.region}:{account.account_id}'
+        self.url = ''
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.bytes = 0
+        self.status = None
+        self.attempts = 0
+        self.cache = None
+        self.outcome = None
+        self.missing_fields = []
+        self.source = None
+        self.hedged = False
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+
+    def add(self, phase, seconds):
+        self.phases[phase] += seconds
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def absorb(self, other):
+        """Take over the network-side details of an inner record (e.g. a hedged request that won)."""
+        self.url = other.url
+        self.bytes = other.bytes
+        self.status = other.status
+        self.attempts += other.attempts
+        self.cache = other.cache
+        for name, seconds in other.phases.items():
+            if name != 'queue':
+                self.add(name, seconds)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.add('queue', self.started - self.submitted)
+
+    def finish(self, rank_info):
+        self.finished = time.perf_counter()
+        self.outcome, self.missing_fields = classify_result(rank_info)
+
+    @property
+    def latency(self):
+        """Submission to result, queueing included."""
+        if self.finished is None:
+            return None
+        return self.finished - self.submitted
+
+    def to_dict(self):
+        return {
+            'account': self.account,
+            'url': self.url,
+            'outcome': self.outcome,
+            'source': self.source,
+            'hedged': self.hedged,
+            'missing_fields': self.missing_fields,
+            'status': self.status,
+            'attempts': self.attempts,
+            'cache': self.cache,
+            'bytes': self.bytes,
+            'latency_ms': round(self.latency * 1000, 2) if self.latency is not None else None,
+            'phases_ms': {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()},
+        }
+
+
+class RunReport:
+    def __init__(self, label='refresh'):
+        self.label = label
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._end = None
+        self.save = None
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def new_record(self, account):
+        record = FetchRecord(account)
+        with self._lock:
+            self._records[record.account] = record
+        return record
+
+    def record_for(self, account):
+        with self._lock:
+            return self._records.get(f'{account.region}:{account.account_id}')
+
+    def finish(self):
+        self._end = time.perf_counter()
+
+    def record_save(self, writer):
+        """Flush a WriteBehindWriter now, recording how long the write took and the writer's counters."""
+        start = time.perf_counter()
+        writer.flush()
+        self.save = {'flush_ms': round((time.perf_counter() - start) * 1000, 2), **writer.stats()}
+
+    def summary(self):
+        with self._lock:
+            records = list(self._records.values())
+        done = [r for r in records if r.finished is not None]
+        end = self._end if self._end is not None else time.perf_counter()
+        latencies = sorted(r.latency for r in done)
+        service = sorted(r.latency - r.phases['queue'] for r in done)
+        phases = {}
+        for name in PHASES:
+            values = sorted(r.phases[name] for r in done)
+            phases[name] = {f'p{p}_ms': round(percentile(values, p) * 1000, 2) for p in PERCENTILES}
+            phases[name]['total_ms'] = round(sum(values) * 1000, 2)
+        return {
+            'label': self.label,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_s': round(end - self._start, 3),
+            'accounts': len(records),
+            'completed': len(done),
+            'outcomes': dict(Counter(r.outcome for r in done)),
+            'statuses': dict(Counter(str(r.status) for r in done if r.status is not None)),
+            'cache': dict(Counter(r.cache for r in done if r.cache)),
+            'sources': dict(Counter(r.source for r in done if r.source)),
+            'hedged': sum(1 for r in done if r.hedged),
+            'bytes': sum(r.bytes for r in done),
+            'retries': sum(max(0, r.attempts - 1) for r in done),
+            'latency_ms': {f'p{p}': round(percentile(latencies, p) * 1000, 2) for p in PERCENTILES},
+            # Latency once a worker picked the fetch up, i.e. without queueing
+            'service_ms': {f'p{p}': round(percentile(service, p) * 1000, 2) for p in PERCENTILES},
+            'phases': phases,
+            'save': self.save,
+        }
+
+    def describe(self):
+        s = self.summary()
+        outcomes = ', '.join(f'{k}={v}' for k, v in sorted(s['outcomes'].items()))
+        latency = s['latency_ms']
+        saved = f", saved in {s['save']['flush_ms']:.0f} ms" if s['save'] else ''
+        return (f"{s['label']}: {s['completed']}/{s['accounts']} accounts in {s['wall_s']:.1f}s "
+                f"(p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms, p99 {latency['p99']:.0f} ms; "
+                f"{outcomes}){saved}")
+
+    def write(self, path=None):
+        """Write the summary and every record as JSON (next to the accounts file by default)."""
+        path = path or get_refresh_report_file()
+        with self._lock:
+            records = [r.to_dict() for r in self._records.values()]
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': self.summary(), 'records': records}, f, indent=2)
+        os.replace(tmp_path, path)
+        return path
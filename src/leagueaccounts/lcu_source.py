@@ -0,0 +1,224 @@
+"""
+Rank source backed by the local League client API (LCU).
+While the client is running it writes a lockfile holding the port and
+password of its local API, which returns the signed-in summoner's ranked
+stats in milliseconds. Any other account, or no running client, falls
+through to the fallback source (normally the web scraper).
+"""
+import os
+import threading
+import time
+import warnings
+
+import requests
+import urllib3
+
+from .extractors import CURRENT_FIELDS
+from .instrumentation import FetchRecord
+from .rank_sources import RankSource, normalize_rank_info, APEX_TIERS
+from .utils import last_season_label
+
+LOCKFILE_ENV = 'LEAGUE_LOCKFILE'
+DEFAULT_LOCKFILE_PATHS = (
+    r'C:\Riot Games\League of Legends\lockfile',
+    r'D:\Riot Games\League of Legends\lockfile',
+)
+LCU_USER = 'riot'
+LCU_TIMEOUT = 2.0
+# The signed-in identity is re-checked at most this often (seconds), so a
+# bulk refresh does not ask the client once per account
+IDENTITY_TTL = 5.0
+
+CURRENT_SUMMONER = '/lol-summoner/v1/current-summoner'
+RANKED_STATS = '/lol-ranked/v1/current-ranked-stats'
+REGION_LOCALE = '/riotclient/region-locale'
+SOLO_QUEUE = 'RANKED_SOLO_5x5'
+
+# Requests to the client skip certificate checks (see _read_lockfile); don't warn on every one.
+# Only loopback requests are silenced: a process-wide filter, unlike catch_warnings,
+# is safe with fetches running on several threads
+warnings.filterwarnings('ignore', message=r"Unverified HTTPS request is being made to host '127\.0\.0\.1'",
+                        category=urllib3.exceptions.InsecureRequestWarning)
+
+
+class Lockfile:
+    """Parsed 'name:pid:port:password:protocol' lockfile."""
+
+    def __init__(self, name, pid, port, password, protocol):
+        self.name = name
+        self.pid = int(pid)
+        self.port = int(port)
+        self.password = password
+        self.protocol = protocol
+
+    @classmethod
+    def parse(cls, text):
+        parts = text.strip().split(':')
+        if len(parts) != 5:
+            raise ValueError(f"Unexpected lockfile format: {text!r}")
+        return cls(*parts)
+
+    @property
+    def base_url(self):
+        return f'{self.protocol}://127.0.0.1:{self.port}'
+
+
+def lockfile_paths():
+    path = os.environ.get(LOCKFILE_ENV)
+    return (path,) if path else DEFAULT_LOCKFILE_PATHS
+
+
+def _riot_id(name):
+    return name.replace(' ', '').lower()
+
+
+def _rank_text(tier, division):
+    tier = (tier or '').capitalize()
+    if not tier or tier in ('None', 'Unranked'):
+        return 'Unranked'
+    if tier in APEX_TIERS or not division or division == 'NA':
+        return tier
+    return f'{tier} {division}'
+
+
+class LcuRankSource(RankSource):
+    name = 'lcu'
+
+    def __init__(self, fallback, paths=None, timeout=LCU_TIMEOUT):
+        self.fallback = fallback
+        self.paths = paths
+        self.timeout = timeout
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._lockfile_key = None
+        self._lockfile = None
+        self._session = None
+        self._identity = None
+        self._identity_at = 0.0
+
+    def summoner_url(self, account):
+        return self.fallback.summoner_url(account)
+
+    def _read_lockfile(self):
+        """Return the running client's Lockfile, or None. Re-read only when the file changes."""
+        for path in self.paths or lockfile_paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            key = (path, stat.st_mtime_ns, stat.st_size)
+            if key != self._lockfile_key:
+                with open(path, 'r', encoding='utf-8') as f:
+                    lockfile = Lockfile.parse(f.read())
+                with self._lock:
+                    if self._session is not None:
+                        self._session.close()
+                    session = requests.Session()
+                    session.auth = (LCU_USER, lockfile.password)
+                    # The client serves its own self-signed certificate on loopback only
+                    session.verify = False
+                    self._session = session
+                    self._lockfile, self._lockfile_key = lockfile, key
+                    self._identity = None
+            return self._lockfile
+        return None
+
+    def _get_json(self, lockfile, endpoint, timeout):
+        response = self._session.get(lockfile.base_url + endpoint, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _current_identity(self, lockfile, timeout):
+        """(riot id, region, summoner payload) of the signed-in summoner."""
+        now = time.monotonic()
+        if self._identity is not None and now - self._identity_at < IDENTITY_TTL:
+            return self._identity
+        summoner = self._get_json(lockfile, CURRENT_SUMMONER, timeout)
+        riot_id = _riot_id(f"{summoner.get('gameName', '')}#{summoner.get('tagLine', '')}")
+        try:
+            locale = self._get_json(lockfile, REGION_LOCALE, timeout)
+            region = (locale.get('webRegion') or locale.get('region') or '').lower()
+        except (requests.RequestException, ValueError):
+            region = ''
+        self._identity, self._identity_at = (riot_id, region, summoner), now
+        return self._identity
+
+    def _timeout(self, deadline):
+        if deadline is None:
+            return self.timeout
+        return max(0.05, min(self.timeout, deadline - time.monotonic()))
+
+    def lookup(self, account, current_only=False, deadline=None):
+        """Rank info for account from the client, or None if the client cannot answer for it."""
+        try:
+            lockfile = self._read_lockfile()
+        except (OSError, ValueError):
+            return None
+        if lockfile is None:
+            return None
+        timeout = self._timeout(deadline)
+        try:
+            riot_id, region, summoner = self._current_identity(lockfile, timeout)
+            if riot_id != _riot_id(account.name) or (region and region != account.region):
+                return None
+            stats = self._get_json(lockfile, RANKED_STATS, timeout)
+        except (requests.RequestException, ValueError):
+            # Client closed, restarting or not logged in yet
+            with self._lock:
+                self._identity = None
+            return None
+        return self._rank_info(summoner, stats, current_only)
+
+    @staticmethod
+    def _rank_info(summoner, stats, current_only):
+        queue = (stats.get('queueMap') or {}).get(SOLO_QUEUE)
+        if queue is None:
+            queue = next((q for q in stats.get('queues') or [] if q.get('queueType') == SOLO_QUEUE), {})
+        tier = queue.get('tier') or ''
+        ranked = tier.upper() not in ('', 'NONE', 'UNRANKED')
+        reached = _rank_text(queue.get('previousSeasonHighestTier'), queue.get('previousSeasonHighestDivision'))
+        finished = _rank_text(queue.get('previousSeasonEndTier'), queue.get('previousSeasonEndDivision'))
+        rank_info = normalize_rank_info({
+            'tier': tier if ranked else 'Unranked',
+            'division': queue.get('division', '') if ranked else '',
+            'lp': queue.get('leaguePoints', '') if ranked else '',
+            'level': summoner.get('summonerLevel', ''),
+            'reached_last_season': reached,
+            'finished_last_season': finished,
+            # The client only knows the previous season; the page lists them all
+            'season_history': {last_season_label(): [reached, finished]} if reached != 'Unranked' else {},
+        })
+        if current_only:
+            return {key: rank_info[key] for key in CURRENT_FIELDS}
+        return rank_info
+
+    def fetch_rank(self, account, current_only=False, deadline=None, record=None):
+        if record is None:
+            record = FetchRecord(account)
+        if record.started is None:
+            record.start()
+        with record.phase('request'):
+            rank_info = self.lookup(account, current_only, deadline)
+        if rank_info is None:
+            return self.fallback.fetch_rank(account, current_only=current_only, deadline=deadline, record=record)
+        with self._lock:
+            self.hits += 1
+        record.source = self.name
+        record.url = self._lockfile.base_url + RANKED_STATS
+        record.finish(rank_info)
+        return rank_info
+
+    def prewarm(self):
+        self.fallback.prewarm()
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            self._lockfile_key = None
+        self.fallback.close()
+
+    async def aclose(self):
+        await self.fallback.aclose()
+
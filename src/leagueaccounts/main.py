@@ -2,9 +2,13 @@
 LeagueAccounts Main Entry Point
 """
 import sys
+import multiprocessing
 
 # Lazy import to reduce startup time
 def main():
+    # Parser worker processes re-run the frozen exe; let them bootstrap first
+    multiprocessing.freeze_support()
+
     # Fix DPI awareness on Windows to prevent blur
     if sys.platform == 'win32':
         try:
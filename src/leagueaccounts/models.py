@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Optional
 
+from .utils import season_sort_key
+
 @dataclass
 class Account:
     account_id: str
@@ -14,4 +16,27 @@ class Account:
     lp: str = ''
     level: str = ''
     reached_last_season: str = 'N/A'
-    finished_last_season: str = 'N/A' 
\ No newline at end of file
+    finished_last_season: str = 'N/A'
+    last_fetched: float = 0.0
+    last_changed: float = 0.0
+    unchanged_fetches: int = 0
+    # Season or split label -> [reached, finished], as shown on the summoner page
+    season_history: dict = field(default_factory=dict)
+
+    def has_rank_data(self):
+        """True once the account holds values from a successful fetch.
+
+        Rosters saved before last_fetched existed load with it at 0, so real
+        rank data counts too.
+        """
+        return (self.last_fetched > 0 or self.tier not in ('Unranked', 'Error', '')
+                or bool(self.level) or bool(self.season_history))
+
+    def season_rank(self, label):
+        """(reached, finished) for a season label such as 'Season 2024 (Split 2)', or None."""
+        entry = self.season_history.get(label)
+        return tuple(entry) if entry else None
+
+    def seasons(self):
+        """Season labels in chronological order."""
+        return sorted(self.season_history, key=season_sort_key)
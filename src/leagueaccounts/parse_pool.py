@@ -0,0 +1,114 @@
+"""
+Process pool for summoner page parsing.
+Fetch threads hand raw page bytes to parser processes so that parsing
+during a bulk refresh scales with cores instead of sharing one GIL.
+If a worker process dies the pool is replaced; after MAX_RESTARTS
+replacements pages are parsed on the calling thread instead.
+"""
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .extractors import get_extractor, DEFAULT_EXTRACTOR, ALL_FIELDS
+
+_extractors = {}
+MAX_RESTARTS = 3
+
+
+def extract_rank_info(page, encoding=None, backend=DEFAULT_EXTRACTOR, fields=ALL_FIELDS):
+    """Parse one page in a worker process. page may be bytes or already-decoded text."""
+    if isinstance(page, bytes):
+        page = page.decode(encoding or 'utf-8', errors='replace')
+    extractor = _extractors.get(backend)
+    if extractor is None:
+        extractor = _extractors[backend] = get_extractor(backend)
+    return extractor.extract(page, fields)
+
+
+def default_workers():
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+class ParsePool:
+    def __init__(self, workers=None):
+        self.workers = workers or default_workers()
+        self.restarts = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """The process pool, or None once it has broken too often to keep replacing."""
+        # Worker processes are only spawned once something needs parsing
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None and self.restarts <= MAX_RESTARTS:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _discard(self, executor):
+        """Drop a broken pool so the next submit starts a fresh one."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.restarts += 1
+            if self.restarts > MAX_RESTARTS:
+                print(f"Parser processes keep dying ({self.restarts} times); parsing in-process from now on")
+        executor.shutdown(wait=False)
+
+    def submit(self, page, encoding=None, backend=DEFAULT_EXTRACTOR, fields=ALL_FIELDS):
+        """Parse in a worker process; returns a Future of the rank info dict.
+
+        A page whose worker died is retried once on a fresh pool.
+        """
+        result = Future()
+        self._submit(result, (page, encoding, backend, tuple(fields)), retry=True)
+        return result
+
+    def _submit(self, result, args, retry):
+        executor = self.executor
+        if executor is None:
+            try:
+                result.set_result(extract_rank_info(*args))
+            except Exception as e:
+                result.set_exception(e)
+            return
+        try:
+            future = executor.submit(extract_rank_info, *args)
+        except BrokenProcessPool as e:
+            self._broken(executor, e, result, args, retry)
+            return
+        except RuntimeError as e:
+            # Shut down under us
+            result.set_exception(e)
+            return
+
+        def done(f):
+            if f.cancelled():
+                result.cancel()
+            elif isinstance(f.exception(), BrokenProcessPool):
+                self._broken(executor, f.exception(), result, args, retry)
+            elif f.exception() is not None:
+                result.set_exception(f.exception())
+            else:
+                result.set_result(f.result())
+        future.add_done_callback(done)
+
+    def _broken(self, executor, error, result, args, retry):
+        self._discard(executor)
+        if retry:
+            self._submit(result, args, retry=False)
+        else:
+            # Broke twice in a row: likely this page, so let it fail alone
+            result.set_exception(error)
+
+    def parse(self, page, encoding=None, backend=DEFAULT_EXTRACTOR, fields=ALL_FIELDS):
+        return self.submit(page, encoding, backend, fields).result()
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
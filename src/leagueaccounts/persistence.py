@@ -0,0 +1,248 @@
+"""
+Account roster persistence.
+JsonAccountStore reads and atomically rewrites the accounts file.
+JournaledAccountStore keeps that file as a snapshot and appends each
+change to a journal next to it, folding the journal back into a new
+snapshot once it has grown past a threshold.
+WriteBehindWriter coalesces save requests: callers mark the roster dirty
+and one background write follows after a short delay, however many
+changes arrived in between.
+
+open_store picks the backend: these JSON files by default, or the
+SQLite database in sqlite_store when LEAGUEACCOUNTS_STORE=sqlite.
+
+A change is a dict: {'op': 'add' | 'set' | 'del', 'key': [region, account_id],
+'fields': {...}}, where 'add' carries the whole account record and 'set'
+only the fields that changed.
+"""
+import json
+import os
+import threading
+
+DEFAULT_SAVE_DELAY = 1.0    # seconds between the first unsaved change and the write
+JOURNAL_SUFFIX = '.journal'
+# The journal is folded into the snapshot once larger than both of these
+COMPACT_MIN_BYTES = 64 * 1024
+COMPACT_RATIO = 0.5         # of the snapshot's size
+STORE_ENV = 'LEAGUEACCOUNTS_STORE'
+
+
+def replay(records, changes):
+    """Apply changes, in order, to a list of account records. Returns the new list."""
+    by_key = {(r.get('region'), r.get('account_id')): r for r in records}
+    for change in changes:
+        key = tuple(change['key'])
+        if change['op'] == 'add':
+            by_key[key] = dict(change['fields'])
+        elif change['op'] == 'set':
+            if key in by_key:
+                by_key[key] = {**by_key[key], **change['fields']}
+        elif change['op'] == 'del':
+            by_key.pop(key, None)
+    return list(by_key.values())
+
+
+class JsonAccountStore:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """Return the stored account dicts, or [] if there is no file yet."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, records):
+        """Replace the file with records; a crash leaves either the old or the new file."""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def write(self, changes, snapshot):
+        """Persist pending changes; this store always rewrites the whole roster."""
+        self.save(snapshot())
+
+    def close(self):
+        pass
+
+
+class JournaledAccountStore(JsonAccountStore):
+    def __init__(self, path, journal_path=None, compact_min_bytes=COMPACT_MIN_BYTES,
+                 compact_ratio=COMPACT_RATIO):
+        super().__init__(path)
+        self.journal_path = journal_path or path + JOURNAL_SUFFIX
+        self.compact_min_bytes = compact_min_bytes
+        self.compact_ratio = compact_ratio
+        self.snapshot_bytes = self._size(self.path)
+        self.journal_bytes = self._size(self.journal_path)
+        self.appended = 0
+        self.compactions = 0
+
+    @staticmethod
+    def _size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def _read_journal(self):
+        changes = []
+        try:
+            with open(self.journal_path, 'rb') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return changes
+        for number, line in enumerate(lines, 1):
+            try:
+                changes.append(json.loads(line))
+            except ValueError:
+                if number == len(lines):
+                    # A crash mid-append left a torn last line; cut it off before appending again
+                    good_bytes = sum(len(l) for l in lines[:-1])
+                    with open(self.journal_path, 'r+b') as f:
+                        f.truncate(good_bytes)
+                    self.journal_bytes = good_bytes
+                else:
+                    print(f"Skipping unreadable journal entry {number} in {self.journal_path}")
+        return changes
+
+    def load(self):
+        """Return the snapshot's account dicts with the journal replayed over them."""
+        return replay(super().load(), self._read_journal())
+
+    def append(self, changes):
+        data = ''.join(json.dumps(change, separators=(',', ':')) + '\n' for change in changes)
+        data = data.encode('utf-8')
+        with open(self.journal_path, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_bytes += len(data)
+        self.appended += len(changes)
+
+    def needs_compaction(self):
+        return self.journal_bytes > max(self.compact_min_bytes, self.snapshot_bytes * self.compact_ratio)
+
+    def save(self, records):
+        super().save(records)
+        self.snapshot_bytes = self._size(self.path)
+
+    def compact(self, records):
+        """Write records as the new snapshot, then empty the journal."""
+        self.save(records)
+        # Replaying the old journal over the new snapshot gives the same roster,
+        # so a crash between these two steps loses nothing
+        with open(self.journal_path, 'wb') as f:
+            os.fsync(f.fileno())
+        self.journal_bytes = 0
+        self.compactions += 1
+
+    def write(self, changes, snapshot):
+        if changes:
+            self.append(changes)
+        if self.needs_compaction():
+            self.compact(snapshot())
+
+
+def open_store(accounts_file, backend=None, db_file=None):
+    """Account store for backend 'json' or 'sqlite' (default: $LEAGUEACCOUNTS_STORE, else 'json').
+
+    The SQLite store imports accounts_file and its journal the first time it is opened.
+    """
+    backend = (backend or os.environ.get(STORE_ENV) or 'json').lower()
+    json_store = JournaledAccountStore(accounts_file)
+    if backend == 'json':
+        return json_store
+    if backend != 'sqlite':
+        raise ValueError(f"Unknown account store {backend!r}")
+    from .sqlite_store import SqliteAccountStore
+    from .utils import get_accounts_db_file
+    store = SqliteAccountStore(db_file or get_accounts_db_file())
+    migrated = store.migrate_from(json_store)
+    if migrated:
+        print(f"Imported {migrated} accounts from {accounts_file} into {store.path}")
+    return store
+
+
+class WriteBehindWriter:
+    """Debounced background saves of snapshot() to store.
+
+    on_error(exception) is called from the writer thread when a write fails;
+    the roster stays dirty and is written again on the next change or flush.
+    """
+
+    def __init__(self, store, snapshot, delay=DEFAULT_SAVE_DELAY, on_error=None):
+        self.store = store
+        self.snapshot = snapshot
+        self.delay = delay
+        self.on_error = on_error
+        self.requested = 0
+        self.writes = 0
+        self.errors = 0
+        self._dirty = False
+        self._changes = []
+        self._timer = None
+        self._closed = False
+        self._lock = threading.Lock()
+        # Held for a whole write so a flush never overlaps the timer's write
+        self._write_lock = threading.Lock()
+
+    def mark_dirty(self, change=None):
+        """Schedule a write, with the change that made it necessary if there is one."""
+        with self._lock:
+            self.requested += 1
+            self._dirty = True
+            if change is not None:
+                self._changes.append(change)
+            if self._closed:
+                return
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self):
+        """Write now if anything changed. Returns True if the roster is saved."""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return True
+                self._dirty = False
+                changes, self._changes = self._changes, []
+            try:
+                self.store.write(changes, self.snapshot)
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                    self._changes[:0] = changes
+                    self.errors += 1
+                if self.on_error is not None:
+                    self.on_error(e)
+                return False
+            with self._lock:
+                self.writes += 1
+            return True
+
+    def close(self):
+        """Cancel the pending timer and write any unsaved changes."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {'requested': self.requested, 'writes': self.writes,
+                    'saved': max(0, self.requested - self.writes - (1 if self._dirty else 0)),
+                    'errors': self.errors}
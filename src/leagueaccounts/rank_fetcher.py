@@ -1,126 +1,458 @@
 import requests
-from bs4 import BeautifulSoup
-import re
-import bs4
-import html
+import asyncio
+import codecs
+import hashlib
+import threading
+import time
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from .extractors import get_extractor, last_season, DEFAULT_EXTRACTOR, ALL_FIELDS, CURRENT_FIELDS
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimiter, THROTTLE_STATUSES, parse_retry_after, backoff_delay
+from .circuit_breaker import CircuitBreaker
+from .utils import format_summoner_name
+from .instrumentation import FetchRecord
+from .rank_sources import RankSource, SOURCE_FAILURES
 
-class RankFetcher:
-    def fetch_rank(self, account):
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+BASE_URL = 'https://www.leagueofgraphs.com'
+STREAM_CHUNK_SIZE = 8192
+MAX_RETRIES = 3
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 15.0
+# aiohttp connection pool size
+ASYNC_MAX_IN_FLIGHT = 64
+# Failure kinds that count towards the circuit breaker: the source's own failures,
+# plus throttling that outlasted every retry (no reason to try another source, though)
+BREAKER_FAILURES = SOURCE_FAILURES + ('rate_limited',)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+def _accept_encoding():
+    # urllib3 only decodes brotli when one of these packages is installed
+    for module in ('brotli', 'brotlicffi'):
         try:
-            region = account.region
-            formatted_name = account.name.replace('#', '-').replace(' ', '+').replace("--", "-")
-            url = f'https://www.leagueofgraphs.com/summoner/{region}/{formatted_name}'
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            tier = 'Unranked'
-            division = ''
-            lp = ''
-            level = ''
-
-            # Fetch level information
-            level = ''
-            
-            # Try multiple selectors for level information
-            level_selectors = [
-                'div.summonerLevel',
-                'span.summonerLevel',
-                '.summonerLevel',
-                'div[class*="level"]',
-                'span[class*="level"]',
-                '.profile-level',
-                '.summoner-level'
-            ]
-            
-            for selector in level_selectors:
-                level_element = soup.select_one(selector)
-                if level_element:
-                    level_text = level_element.get_text().strip()
-                    # Try different patterns to extract level number
-                    level_patterns = [
-                        r'Level (\d+)',
-                        r'(\d+)',
-                        r'Lvl (\d+)',
-                        r'Lv (\d+)'
-                    ]
-                    for pattern in level_patterns:
-                        level_match = re.search(pattern, level_text)
-                        if level_match:
-                            level = level_match.group(1)
-                            break
-                    if level:
-                        break
-            
-            # If still no level found, try looking in meta tags or other elements
-            if not level:
-                # Look for level in any text containing "Level" or "Lvl"
-                for element in soup.find_all(text=re.compile(r'[Ll]evel|[Ll]vl')):
-                    level_match = re.search(r'[Ll]evel\s*(\d+)|[Ll]vl\s*(\d+)', element)
-                    if level_match:
-                        level = level_match.group(1) or level_match.group(2)
-                        break
-
-            lp_div = soup.select_one('div.league-points')
-            if lp_div:
-                lp_span = lp_div.select_one('span.leaguePoints')
-                if lp_span:
-                    lp = lp_span.get_text().strip()
-
-            meta_desc = soup.find('meta', attrs={'name': 'twitter:description'})
-            if isinstance(meta_desc, bs4.element.Tag) and meta_desc.has_attr('content'):
-                desc = meta_desc['content']
-                if isinstance(desc, str) and ' - ' in desc:
-                    rank_part = desc.split(' - ')[0]
-                    match = re.search(r'([A-Za-z]+)\s+([IV]+)', rank_part)
-                    if match:
-                        tier = match.group(1)
-                        division = match.group(2)
-                    else:
-                        match = re.search(r'([A-Za-z]+)', rank_part)
-                        if match:
-                            tier = match.group(1)
-                            division = ''
-
-            reached_last_season = 'Unranked'
-            finished_last_season = 'Unranked'
-            tooltip_divs = soup.find_all('div', attrs={'tooltip': True})
-            s2025_tooltip = None
-            
-            # Look specifically for Season 2025 tooltip
-            for div in tooltip_divs:
-                tooltip_content = html.unescape(div.get('tooltip', ''))
-                if 'This player reached' in tooltip_content and 'Ranked Solo/Duo' in tooltip_content:
-                    # Check if it's Season 2025
-                    if re.search(r'during Season 2025', tooltip_content):
-                        s2025_tooltip = tooltip_content
-                        break
-            
-            if s2025_tooltip:
-                # Extract rank data from S2025 tooltip
-                # Pattern for Season 2025 (without split): "during Season 2025."
-                reached_match = re.search(r'This player reached ([A-Za-z]+(?:\s+\d+LP)?(?:\s+[IV]+)?) during Season 2025\. At the end of the season, this player was ([A-Za-z]+(?:\s+\d+LP)?(?:\s+[IV]+)?)\.', s2025_tooltip)
-                
-                if reached_match:
-                    reached_last_season = reached_match.group(1).strip()
-                    finished_last_season = reached_match.group(2).strip()
-            return {
-                'tier': tier,
-                'division': division,
-                'lp': lp,
-                'level': level,
-                'reached_last_season': reached_last_season,
-                'finished_last_season': finished_last_season
-            }
+            __import__(module)
+            return 'gzip, deflate, br'
+        except ImportError:
+            continue
+    return 'gzip, deflate'
+
+def _error_result(kind):
+    return {
+        'tier': 'Error',
+        'division': '',
+        'lp': '',
+        'level': '',
+        'reached_last_season': '...',
+        'finished_last_season': '...',
+        'error': kind
+    }
+
+class FetchError(Exception):
+    def __init__(self, kind, message=''):
+        super().__init__(message or kind)
+        self.kind = kind
+
+class RankFetcher(RankSource):
+    name = 'leagueofgraphs'
+
+    def __init__(self, base_url=BASE_URL, pool_connections=4, pool_maxsize=8, cache=None,
+                 extractor=DEFAULT_EXTRACTOR, streaming=False, rate_limiter=None, max_retries=MAX_RETRIES,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT, breaker=None, parse_pool=None):
+        self.base_url = base_url.rstrip('/')
+        self.streaming = streaming
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.parse_pool = parse_pool
+        self.cache = cache
+        self.extractor = get_extractor(extractor)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._async_session = None
+        self._async_loop = None
+
+    @property
+    def session(self):
+        """Long-lived keep-alive session shared by all fetch threads."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                                          pool_maxsize=self.pool_maxsize,
+                                          pool_block=True)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    session.headers.update({
+                        'User-Agent': USER_AGENT,
+                        'Accept-Encoding': _accept_encoding(),
+                    })
+                    self._session = session
+        return self._session
+
+    def prewarm(self):
+        """Open a pooled connection ahead of the first refresh (TCP + TLS handshake)."""
+        try:
+            self.session.head(self.base_url, timeout=(self.connect_timeout, self.read_timeout))
+        except Exception:
+            pass
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def summoner_url(self, account):
+        return f'{self.base_url}/summoner/{account.region}/{format_summoner_name(account.name)}'
+
+    def fetch_rank(self, account, current_only=False, deadline=None, record=None):
+        """Fetch rank info for an account.
+
+        current_only skips the last-season fields; the page is then streamed
+        and the connection dropped as soon as the current rank is found.
+        deadline is a time.monotonic() value after which the fetch gives up.
+        Failures return an 'Error' result with an 'error' kind; 'unavailable'
+        means the circuit breaker is open and no request was sent.
+        Timings, bytes and the outcome are filled into record if given.
+        """
+        if record is None:
+            record = FetchRecord(account)
+        if record.started is None:
+            record.start()
+        record.source = self.name
+        rank_info = self._fetch_classified(account, current_only, deadline, record)
+        record.finish(rank_info)
+        return rank_info
+
+    def _fetch_classified(self, account, current_only, deadline, record):
+        if deadline is not None and time.monotonic() >= deadline:
+            return _error_result('deadline')
+        if not self.breaker.allow():
+            return _error_result('unavailable')
+        try:
+            rank_info = self._fetch(account, current_only, deadline, record)
+        except Exception as e:
+            return self._failed(self._failure_kind(e))
+        self.breaker.record_success()
+        return rank_info
+
+    @staticmethod
+    def _failure_kind(error):
+        if isinstance(error, FetchError):
+            return error.kind
+        if isinstance(error, (requests.Timeout, asyncio.TimeoutError, TimeoutError)):
+            return 'timeout'
+        if isinstance(error, requests.HTTPError):
+            status = error.response.status_code if error.response is not None else 0
+            return 'server' if status >= 500 else 'http'
+        if aiohttp is not None and isinstance(error, aiohttp.ClientResponseError):
+            return 'server' if error.status >= 500 else 'http'
+        if isinstance(error, requests.RequestException):
+            return 'network'
+        if aiohttp is not None and isinstance(error, aiohttp.ClientError):
+            return 'network'
+        return 'parse'
+
+    def _failed(self, kind):
+        if kind in BREAKER_FAILURES:
+            self.breaker.record_failure()
+        elif kind == 'deadline':
+            self.breaker.release()
+        else:
+            # The site answered, so it is up even if this page was unusable
+            self.breaker.record_success()
+        return _error_result(kind)
+
+    def _fetch(self, account, current_only, deadline, record):
+        fields = CURRENT_FIELDS if current_only else ALL_FIELDS
+        url = record.url = self.summoner_url(account)
+        entry = self.cache.get(url, fields) if self.cache else None
+        stream = (self.streaming or current_only) and hasattr(self.extractor, 'scanner')
+        response = self._get(url, ResponseCache.conditional_headers(entry), stream, deadline, record)
+        if entry and response.status_code == 304:
+            record.cache = 'not_modified'
+            self.cache.record_hit(url, not_modified=True, response=response)
+            response.close()
+            return self._cached_result(entry, fields)
+        response.raise_for_status()
+        if stream:
+            return self._stream_parse(response, fields, record)
+        record.bytes = len(response.content)
+        if self.cache is None:
+            with record.phase('parse'):
+                return self._parse(response)
+        content_hash = hashlib.sha1(response.content).hexdigest()
+        if entry and entry.get('hash') == content_hash:
+            # Same bytes as last time: skip the parse entirely
+            record.cache = 'hit'
+            self.cache.record_hit(url, response=response)
+            return self._cached_result(entry, fields)
+        record.cache = 'miss'
+        with record.phase('parse'):
+            rank_info = self._parse(response)
+        self.cache.store(url, response, content_hash, rank_info)
+        return rank_info
+
+    @staticmethod
+    def _cached_result(entry, fields):
+        result = {key: entry['result'][key] for key in fields}
+        if 'season_history' in result:
+            # Which season is the last one follows the clock, not the page: recompute on every hit
+            result['reached_last_season'], result['finished_last_season'] = last_season(result['season_history'])
+        return result
+
+    @staticmethod
+    def _remaining(deadline):
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise FetchError('deadline')
+        return remaining
+
+    def _sleep(self, delay, deadline):
+        remaining = self._remaining(deadline)
+        if remaining is not None and delay >= remaining:
+            raise FetchError('deadline')
+        time.sleep(delay)
+
+    @staticmethod
+    def _throttle_error(status, host):
+        """Error for a throttle status that outlasted every retry."""
+        # A 503 that never clears is the site being down, not busy
+        kind = 'server' if status >= 500 else 'rate_limited'
+        return FetchError(kind, f'HTTP {status} from {host}')
+
+    def _get(self, url, headers, stream, deadline, record):
+        """GET through the host's token bucket, retrying throttling and network errors with backoff."""
+        host = urlparse(url).netloc
+        for attempt in range(self.max_retries + 1):
+            with record.phase('wait'):
+                if not self.rate_limiter.acquire(host, max_wait=self._remaining(deadline)):
+                    raise FetchError('deadline')
+            remaining = self._remaining(deadline)
+            read_timeout = self.read_timeout if remaining is None else min(self.read_timeout, remaining)
+            record.attempts += 1
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, stream=stream,
+                                            timeout=(self.connect_timeout, read_timeout))
+            except (requests.ConnectionError, requests.Timeout):
+                record.add('request', time.perf_counter() - start)
+                if attempt == self.max_retries:
+                    raise
+                with record.phase('wait'):
+                    self._sleep(backoff_delay(attempt), deadline)
+                continue
+            # elapsed stops at the response headers; the rest of the call read the body
+            headers_time = response.elapsed.total_seconds()
+            record.add('request', headers_time)
+            record.add('download', max(0.0, time.perf_counter() - start - headers_time))
+            record.status = response.status_code
+            if response.status_code in THROTTLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                self.rate_limiter.penalize(host, retry_after)
+                response.close()
+                if attempt == self.max_retries:
+                    raise self._throttle_error(response.status_code, host)
+                with record.phase('wait'):
+                    self._sleep(backoff_delay(attempt, retry_after), deadline)
+                continue
+            self.rate_limiter.reward(host)
+            return response
+
+    def _parse(self, response):
+        if self.parse_pool is not None:
+            # Ship the raw bytes; decoding and parsing both happen in the worker process
+            return self.parse_pool.parse(response.content, response.encoding, self.extractor.name)
+        return self.extractor.extract(response.text)
+
+    def _stream_parse(self, response, fields, record):
+        """Feed the body to the scanner chunk by chunk and hang up once every field is found."""
+        scanner = self.extractor.scanner(fields)
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        start = time.perf_counter()
+        parsing = 0.0
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                record.bytes += len(chunk)
+                feed_start = time.perf_counter()
+                scanner.feed(decoder.decode(chunk))
+                parsing += time.perf_counter() - feed_start
+                if scanner.done():
+                    break
+            else:
+                feed_start = time.perf_counter()
+                scanner.feed(decoder.decode(b'', final=True))
+                scanner.close()
+                parsing += time.perf_counter() - feed_start
+        finally:
+            response.close()
+            # Downloading and parsing interleave; split the time between them
+            record.add('parse', parsing)
+            record.add('download', time.perf_counter() - start - parsing)
+        return scanner.result()
+
+    # asyncio API. With aiohttp installed requests are driven by the event
+    # loop itself; without it each fetch runs fetch_rank on a worker thread.
+
+    def _async_client(self):
+        # aiohttp sessions belong to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=ASYNC_MAX_IN_FLIGHT, limit_per_host=ASYNC_MAX_IN_FLIGHT)
+            self._async_session = aiohttp.ClientSession(connector=connector, headers={
+                'User-Agent': USER_AGENT,
+                'Accept-Encoding': _accept_encoding(),
+            })
+            self._async_loop = loop
+        return self._async_session
+
+    async def aclose(self):
+        """Close the aiohttp session; call from the loop that used it."""
+        session, self._async_session = self._async_session, None
+        if session is not None:
+            await session.close()
+
+    async def fetch_rank_async(self, account, current_only=False, deadline=None, record=None):
+        """Coroutine version of fetch_rank with the same arguments and results."""
+        if aiohttp is None:
+            return await asyncio.to_thread(self.fetch_rank, account, current_only, deadline, record)
+        if record is None:
+            record = FetchRecord(account)
+        if record.started is None:
+            record.start()
+        record.source = self.name
+        rank_info = await self._fetch_classified_async(account, current_only, deadline, record)
+        record.finish(rank_info)
+        return rank_info
+
+    async def _fetch_classified_async(self, account, current_only, deadline, record):
+        if deadline is not None and time.monotonic() >= deadline:
+            return _error_result('deadline')
+        if not self.breaker.allow():
+            return _error_result('unavailable')
+        try:
+            rank_info = await self._fetch_async(account, current_only, deadline, record)
+        except asyncio.CancelledError:
+            # Give back the half-open probe slot if this fetch held it
+            self.breaker.release()
+            raise
         except Exception as e:
-            return {
-                'tier': 'Error',
-                'division': '',
-                'lp': '',
-                'level': '',
-                'reached_last_season': '...',
-                'finished_last_season': '...'
-            } 
\ No newline at end of file
+            return self._failed(self._failure_kind(e))
+        self.breaker.record_success()
+        return rank_info
+
+    async def _fetch_async(self, account, current_only, deadline, record):
+        fields = CURRENT_FIELDS if current_only else ALL_FIELDS
+        url = record.url = self.summoner_url(account)
+        entry = self.cache.get(url, fields) if self.cache else None
+        stream = (self.streaming or current_only) and hasattr(self.extractor, 'scanner')
+        response = await self._get_async(url, ResponseCache.conditional_headers(entry), deadline, record)
+        try:
+            if entry and response.status == 304:
+                record.cache = 'not_modified'
+                self.cache.record_hit(url, not_modified=True, response=response)
+                return self._cached_result(entry, fields)
+            response.raise_for_status()
+            encoding = response.charset or 'utf-8'
+            if stream:
+                return await self._stream_parse_async(response, encoding, fields, record)
+            with record.phase('download'):
+                body = await response.read()
+            record.bytes = len(body)
+            if self.cache is None:
+                with record.phase('parse'):
+                    return await self._parse_async(body, encoding)
+            content_hash = hashlib.sha1(body).hexdigest()
+            if entry and entry.get('hash') == content_hash:
+                record.cache = 'hit'
+                self.cache.record_hit(url, response=response)
+                return self._cached_result(entry, fields)
+            record.cache = 'miss'
+            with record.phase('parse'):
+                rank_info = await self._parse_async(body, encoding)
+            self.cache.store(url, response, content_hash, rank_info)
+            return rank_info
+        finally:
+            response.release()
+
+    async def _sleep_async(self, delay, deadline):
+        remaining = self._remaining(deadline)
+        if remaining is not None and delay >= remaining:
+            raise FetchError('deadline')
+        await asyncio.sleep(delay)
+
+    async def _get_async(self, url, headers, deadline, record):
+        """_get() on the event loop: same token bucket, retries and backoff."""
+        session = self._async_client()
+        host = urlparse(url).netloc
+        for attempt in range(self.max_retries + 1):
+            with record.phase('wait'):
+                if not await self.rate_limiter.acquire_async(host, max_wait=self._remaining(deadline)):
+                    raise FetchError('deadline')
+            remaining = self._remaining(deadline)
+            read_timeout = self.read_timeout if remaining is None else min(self.read_timeout, remaining)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=read_timeout)
+            record.attempts += 1
+            try:
+                with record.phase('request'):
+                    response = await session.get(url, headers=headers, timeout=timeout)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+                with record.phase('wait'):
+                    await self._sleep_async(backoff_delay(attempt), deadline)
+                continue
+            record.status = response.status
+            if response.status in THROTTLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                self.rate_limiter.penalize(host, retry_after)
+                response.release()
+                if attempt == self.max_retries:
+                    raise self._throttle_error(response.status, host)
+                with record.phase('wait'):
+                    await self._sleep_async(backoff_delay(attempt, retry_after), deadline)
+                continue
+            self.rate_limiter.reward(host)
+            return response
+
+    async def _parse_async(self, body, encoding):
+        if self.parse_pool is not None:
+            return await asyncio.wrap_future(self.parse_pool.submit(body, encoding, self.extractor.name))
+        return self.extractor.extract(body.decode(encoding, errors='replace'))
+
+    async def _stream_parse_async(self, response, encoding, fields, record):
+        scanner = self.extractor.scanner(fields)
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        start = time.perf_counter()
+        parsing = 0.0
+        try:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                record.bytes += len(chunk)
+                feed_start = time.perf_counter()
+                scanner.feed(decoder.decode(chunk))
+                parsing += time.perf_counter() - feed_start
+                if scanner.done():
+                    # Drop the connection rather than draining the rest of the page
+                    response.close()
+                    break
+            else:
+                feed_start = time.perf_counter()
+                scanner.feed(decoder.decode(b'', final=True))
+                scanner.close()
+                parsing += time.perf_counter() - feed_start
+        finally:
+            record.add('parse', parsing)
+            record.add('download', time.perf_counter() - start - parsing)
+        return scanner.result()
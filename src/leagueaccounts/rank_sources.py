@@ -0,0 +1,325 @@
+"""
+Pluggable rank sources.
+A RankSource turns an account into a rank info dict. RankFetcher (the
+leagueofgraphs scraper) is one; HedgedRankSource wraps a primary and a
+secondary source and sends a backup request to the secondary when the
+primary is slower than its usual tail latency, keeping the first answer,
+or when the primary failed in a way another source might not.
+"""
+import asyncio
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+from .instrumentation import FetchRecord, APEX_TIERS, percentile
+
+RANK_KEYS = ('tier', 'division', 'lp', 'level', 'reached_last_season', 'finished_last_season', 'season_history')
+ROMAN_DIVISIONS = {'1': 'I', '2': 'II', '3': 'III', '4': 'IV'}
+# Failure kinds that mean the source itself is unhealthy (timeouts, dropped
+# connections, 5xx). Only these are worth failing over to another source:
+# a 404, an unparsable page, throttling or an open breaker would go the same way
+SOURCE_FAILURES = ('timeout', 'network', 'server')
+
+# Hedging: the backup fires once the primary is slower than this percentile
+# of its recent successful latencies, and at most HEDGE_BUDGET of requests
+# (plus a small burst) may be hedged so a uniformly slow primary is not doubled
+HEDGE_PERCENTILE = 95
+HEDGE_BUDGET = 0.1
+HEDGE_BURST = 2
+HEDGE_DEFAULT_DELAY = 2.0   # seconds, until enough latencies have been seen
+HEDGE_MIN_DELAY = 0.05
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+DEFAULT_HEDGE_WORKERS = 16
+DEFAULT_MAX_IN_FLIGHT = 64
+
+
+def _digits(value):
+    match = re.search(r'\d+', str(value or ''))
+    return str(int(match.group())) if match else ''
+
+
+def normalize_rank_info(rank_info):
+    """Bring a rank info dict from any source to the scraper's shape.
+
+    Tiers are capitalised ('GOLD' -> 'Gold', empty -> 'Unranked'),
+    divisions are roman numerals (empty for apex tiers) and lp/level are
+    plain digit strings. Error results are returned unchanged.
+    """
+    if rank_info.get('error'):
+        return rank_info
+    result = dict(rank_info)
+    if 'tier' in result:
+        tier = str(result['tier'] or '').strip().capitalize()
+        result['tier'] = tier if tier and tier != 'None' else 'Unranked'
+    if 'division' in result:
+        division = str(result['division'] or '').strip().upper()
+        division = ROMAN_DIVISIONS.get(division, division)
+        if division not in ROMAN_DIVISIONS.values() or result.get('tier') in APEX_TIERS + ('Unranked',):
+            division = ''
+        result['division'] = division
+    for key in ('lp', 'level'):
+        if key in result:
+            result[key] = _digits(result[key])
+    return {key: result[key] for key in RANK_KEYS if key in result}
+
+
+class RankSource:
+    """Base class for rank sources.
+
+    Subclasses implement fetch_rank(account, current_only, deadline, record)
+    returning the normalized rank info dict (or an 'Error' result with an
+    'error' kind) and summoner_url(account), which FetchService also uses
+    to group requests by host.
+    """
+    name = 'source'
+
+    def summoner_url(self, account):
+        raise NotImplementedError
+
+    def fetch_rank(self, account, current_only=False, deadline=None, record=None):
+        raise NotImplementedError
+
+    async def fetch_rank_async(self, account, current_only=False, deadline=None, record=None):
+        return await asyncio.to_thread(self.fetch_rank, account, current_only, deadline, record)
+
+    async def fetch_many(self, accounts, current_only=False, timeout=None, callback=None, report=None,
+                         max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        """Fetch rank info for many accounts concurrently. Returns the results in account order.
+
+        At most max_in_flight fetches run at once. callback(account, rank_info)
+        is called on the loop as each one completes. Cancelling the task
+        cancels every fetch still in flight.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        gate = asyncio.Semaphore(max_in_flight)
+
+        async def fetch_one(account):
+            record = report.new_record(account) if report is not None else None
+            async with gate:
+                rank_info = await self.fetch_rank_async(account, current_only, deadline, record)
+            if callback is not None:
+                callback(account, rank_info)
+            return rank_info
+
+        return await asyncio.gather(*(fetch_one(account) for account in accounts))
+
+    def prewarm(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+class LatencyTracker:
+    """Sliding window of recent successful latencies."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct, default=None):
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return default
+            samples = sorted(self._samples)
+        return percentile(samples, pct)
+
+
+class HedgedRankSource(RankSource):
+    """Primary source with a backup for slow or failed lookups.
+
+    A secondary on the same host should share the primary's circuit breaker.
+    If given, hedge_slot(host) returns the semaphore for backup requests to
+    a host (FetchService.hedge_slot). A backup sent while the primary is
+    still running needs a free slot of it, kept until both have finished;
+    a failover runs in the finished primary's place instead.
+    """
+    name = 'hedged'
+
+    def __init__(self, primary, secondary, hedge_percentile=HEDGE_PERCENTILE, budget=HEDGE_BUDGET,
+                 default_delay=HEDGE_DEFAULT_DELAY, max_workers=DEFAULT_HEDGE_WORKERS, hedge_slot=None):
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_slot = hedge_slot
+        self.hedge_percentile = hedge_percentile
+        self.budget = budget
+        self.default_delay = default_delay
+        self.latency = LatencyTracker()
+        self.requests = 0
+        self.hedges = 0
+        self.backup_wins = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='rank-hedge')
+
+    def summoner_url(self, account):
+        return self.primary.summoner_url(account)
+
+    def hedge_delay(self):
+        """Seconds to wait for the primary before sending the backup."""
+        return max(HEDGE_MIN_DELAY, self.latency.percentile(self.hedge_percentile, self.default_delay))
+
+    def _start_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def _take_hedge(self, failover):
+        # Failing over after a primary error is always allowed; speculative hedges are budgeted
+        with self._lock:
+            if not failover and self.hedges + 1 > self.budget * self.requests + HEDGE_BURST:
+                return False
+            self.hedges += 1
+            return True
+
+    def _start_hedge(self, account):
+        """Decide on a speculative backup. Returns (send, hedge slot to release once both requests end)."""
+        slot = None
+        if self.hedge_slot is not None:
+            slot = self.hedge_slot(urlparse(self.secondary.summoner_url(account)).netloc)
+            if not slot.acquire(blocking=False):
+                return False, None
+        if self._take_hedge(failover=False):
+            return True, slot
+        if slot is not None:
+            slot.release()
+        return False, None
+
+    @staticmethod
+    def _release_after(futures, slot):
+        """Release slot once every one of futures (or tasks) is done, the loser included."""
+        if slot is None:
+            return
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                slot.release()
+        for future in futures:
+            future.add_done_callback(done)
+
+    @staticmethod
+    def _should_fail_over(rank_info):
+        return rank_info.get('error') in SOURCE_FAILURES
+
+    def _finish(self, record, source, rank_info, inner, hedged):
+        if source is self.secondary:
+            with self._lock:
+                self.backup_wins += 1
+        record.absorb(inner)
+        record.source = source.name
+        record.hedged = hedged
+        rank_info = normalize_rank_info(rank_info)
+        record.finish(rank_info)
+        return rank_info
+
+    def _call(self, source, account, current_only, deadline):
+        inner = FetchRecord(account)
+        rank_info = source.fetch_rank(account, current_only=current_only, deadline=deadline, record=inner)
+        if source is self.primary and not rank_info.get('error'):
+            self.latency.add(inner.latency)
+        return source, rank_info, inner
+
+    def fetch_rank(self, account, current_only=False, deadline=None, record=None):
+        if record is None:
+            record = FetchRecord(account)
+        if record.started is None:
+            record.start()
+        self._start_request()
+        primary = self._executor.submit(self._call, self.primary, account, current_only, deadline)
+        pending = {primary}
+        hedged = False
+        done, _ = wait(pending, timeout=self.hedge_delay())
+        if not done:
+            send, slot = self._start_hedge(account)
+            if send:
+                backup = self._executor.submit(self._call, self.secondary, account, current_only, deadline)
+                pending.add(backup)
+                hedged = True
+                self._release_after([primary, backup], slot)
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                source, rank_info, inner = future.result()
+                if not rank_info.get('error'):
+                    # The slower request keeps running (in its own slot); its answer is dropped
+                    return self._finish(record, source, rank_info, inner, hedged)
+            # Failing over replaces the finished primary, so it runs in the caller's host slot
+            if not hedged and self._should_fail_over(rank_info) and self._take_hedge(failover=True):
+                pending.add(self._executor.submit(self._call, self.secondary, account, current_only, deadline))
+                hedged = True
+            if not pending:
+                return self._finish(record, source, rank_info, inner, hedged)
+
+    async def _call_async(self, source, account, current_only, deadline):
+        inner = FetchRecord(account)
+        rank_info = await source.fetch_rank_async(account, current_only, deadline, inner)
+        if source is self.primary and not rank_info.get('error'):
+            self.latency.add(inner.latency)
+        return source, rank_info, inner
+
+    async def fetch_rank_async(self, account, current_only=False, deadline=None, record=None):
+        if record is None:
+            record = FetchRecord(account)
+        if record.started is None:
+            record.start()
+        self._start_request()
+        primary = asyncio.create_task(self._call_async(self.primary, account, current_only, deadline))
+        pending = {primary}
+        hedged = False
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay())
+            if not done:
+                send, slot = self._start_hedge(account)
+                if send:
+                    backup = asyncio.create_task(self._call_async(self.secondary, account, current_only, deadline))
+                    pending.add(backup)
+                    hedged = True
+                    self._release_after([primary, backup], slot)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source, rank_info, inner = task.result()
+                    if not rank_info.get('error'):
+                        return self._finish(record, source, rank_info, inner, hedged)
+                if not hedged and self._should_fail_over(rank_info) and self._take_hedge(failover=True):
+                    pending.add(asyncio.create_task(
+                        self._call_async(self.secondary, account, current_only, deadline)))
+                    hedged = True
+                if not pending:
+                    return self._finish(record, source, rank_info, inner, hedged)
+        finally:
+            # On the event loop the losing request can actually be cancelled
+            for task in pending:
+                task.cancel()
+
+    def stats(self):
+        with self._lock:
+            return {'requests': self.requests, 'hedges': self.hedges, 'backup_wins': self.backup_wins,
+                    'hedge_delay': self.hedge_delay()}
+
+    def prewarm(self):
+        self.primary.prewarm()
+        self.secondary.prewarm()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.primary.close()
+        self.secondary.close()
+
+    async def aclose(self):
+        await self.primary.aclose()
+        await self.secondary.aclose()
@@ -0,0 +1,135 @@
+"""
+Adaptive per-host rate limiting for rank fetches.
+Each host gets a token bucket whose refill rate is halved on 429/503
+responses (honouring Retry-After) and creeps back up on success.
+"""
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+DEFAULT_RATE = 4.0          # requests per second
+DEFAULT_BURST = 8
+MIN_RATE = 0.25
+MAX_RATE = 8.0
+RATE_STEP = 0.1             # additive increase per successful request
+THROTTLE_STATUSES = (429, 503)
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+
+class TokenBucket:
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_BURST, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self):
+        """Take a token, returning how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def refund(self):
+        with self._lock:
+            self._tokens += 1
+
+    def acquire(self, max_wait=None):
+        """Block until a token is available. Returns False, without taking one, if that exceeds max_wait."""
+        wait = self.reserve()
+        if max_wait is not None and wait > max_wait:
+            self.refund()
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, max_wait=None):
+        """acquire() for event loop callers: waits with asyncio.sleep instead of blocking."""
+        wait = self.reserve()
+        if max_wait is not None and wait > max_wait:
+            self.refund()
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def penalize(self, retry_after=None):
+        """Back off after a throttling response."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def reward(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + RATE_STEP)
+
+
+class RateLimiter:
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                # A configured rate above MAX_RATE is also the ceiling to recover to
+                bucket = TokenBucket(self.rate, self.burst, max_rate=max(MAX_RATE, self.rate))
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, host, max_wait=None):
+        return self.bucket(host).acquire(max_wait)
+
+    async def acquire_async(self, host, max_wait=None):
+        return await self.bucket(host).acquire_async(max_wait)
+
+    def penalize(self, host, retry_after=None):
+        self.bucket(host).penalize(retry_after)
+
+    def reward(self, host):
+        self.bucket(host).reward()
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(attempt, retry_after=None, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after:
+        delay = max(delay, min(retry_after, cap))
+    return delay
@@ -0,0 +1,130 @@
+"""
+Persistent cache of summoner page responses.
+Keeps HTTP validators, a content hash and the parsed rank info per URL so
+unchanged pages are revalidated with conditional requests and never re-parsed.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .utils import get_response_cache_file
+
+# Bumped whenever the parsed result gains fields, so older entries are dropped
+CACHE_VERSION = 2
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_SAVE_INTERVAL = 30.0
+
+
+class ResponseCache:
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES, save_interval=DEFAULT_SAVE_INTERVAL):
+        self.path = path or get_response_cache_file()
+        self.max_entries = max_entries
+        self.save_interval = save_interval
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._entries = None
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._lock = threading.RLock()
+
+    def _load(self):
+        entries = OrderedDict()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                for url, entry in data.get('entries', []):
+                    entries[url] = entry
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+        return entries
+
+    @property
+    def entries(self):
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            return self._entries
+
+    def get(self, url, fields=()):
+        """Cached entry for url, or None if there is none or its result lacks any of fields."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None or any(key not in entry.get('result', {}) for key in fields):
+                return None
+            self.entries.move_to_end(url)
+            return entry
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_hit(self, url, not_modified=False, response=None):
+        """Count a reuse of the cached result, refreshing validators if the server sent new ones."""
+        with self._lock:
+            self.hits += 1
+            if not_modified:
+                self.not_modified += 1
+            entry = self.entries.get(url)
+            if entry is not None and response is not None:
+                entry['etag'] = response.headers.get('ETag') or entry.get('etag')
+                entry['last_modified'] = response.headers.get('Last-Modified') or entry.get('last_modified')
+                self._mark_dirty()
+
+    def store(self, url, response, content_hash, result):
+        with self._lock:
+            self.misses += 1
+            self.entries[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'hash': content_hash,
+                'result': dict(result),
+            }
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            data = {'version': CACHE_VERSION, 'entries': list(self._entries.items())}
+            tmp_path = self.path + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                print(f"Error saving response cache: {e}")
+            self._last_save = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._dirty = True
+            self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries or ()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+            }
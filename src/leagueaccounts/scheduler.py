@@ -0,0 +1,217 @@
+"""
+Background refresh scheduler.
+Trickles rank refreshes across the roster while the app is open: one
+account at a time, the most overdue first, at a low steady rate. Each
+account is due once older than AccountManager.refresh_ttl, which grows
+while its rank stays unchanged. The rate backs off after network failures,
+while the machine runs on battery and while the connection is metered.
+"""
+import ctypes
+import json
+import os
+import sys
+import time
+
+from .fetch_service import PRIORITY_BACKGROUND
+from .utils import get_scheduler_file
+
+SCHEDULER_VERSION = 1
+DEFAULT_TICK_INTERVAL = 60.0    # seconds between background fetches
+STARTUP_DELAY = 30.0            # leave the first seconds after launch to the user
+MAX_IDLE_DELAY = 15 * 60        # re-check at least this often when nothing is due
+MAX_BACKOFF = 30 * 60
+BATTERY_FACTOR = 4
+METERED_FACTOR = 4
+RETRY_AFTER = 15 * 60           # a failed account is not retried before this
+# Failures that say the network or the site is in trouble, rather than the account
+BACKOFF_ERRORS = ('network', 'timeout', 'server', 'rate_limited', 'unavailable', 'deadline')
+
+
+class _SYSTEM_POWER_STATUS(ctypes.Structure):
+    _fields_ = [('ACLineStatus', ctypes.c_ubyte),
+                ('BatteryFlag', ctypes.c_ubyte),
+                ('BatteryLifePercent', ctypes.c_ubyte),
+                ('SystemStatusFlag', ctypes.c_ubyte),
+                ('BatteryLifeTime', ctypes.c_ulong),
+                ('BatteryFullLifeTime', ctypes.c_ulong)]
+
+
+class _NL_NETWORK_CONNECTIVITY_HINT(ctypes.Structure):
+    _fields_ = [('ConnectivityLevel', ctypes.c_int),
+                ('ConnectivityCost', ctypes.c_int),
+                ('ApproachingDataLimit', ctypes.c_ubyte),
+                ('OverDataLimit', ctypes.c_ubyte),
+                ('Roaming', ctypes.c_ubyte)]
+
+
+# NL_NETWORK_CONNECTIVITY_COST_HINT values that mean the user pays for data
+_COST_FIXED = 2
+_COST_VARIABLE = 3
+
+
+def on_metered_connection():
+    """True when Windows reports the connection as metered, near its data limit or roaming.
+
+    Needs GetNetworkConnectivityHint (Windows 10 2004+); older systems count as unmetered.
+    """
+    if sys.platform != 'win32':
+        return False
+    try:
+        get_hint = ctypes.WinDLL('iphlpapi').GetNetworkConnectivityHint
+    except (OSError, AttributeError):
+        return False
+    hint = _NL_NETWORK_CONNECTIVITY_HINT()
+    if get_hint(ctypes.byref(hint)) != 0:
+        return False
+    return (hint.ConnectivityCost in (_COST_FIXED, _COST_VARIABLE) or bool(hint.ApproachingDataLimit)
+            or bool(hint.OverDataLimit) or bool(hint.Roaming))
+
+
+def on_battery():
+    """True when the machine runs on battery or battery saver is on (Windows only)."""
+    if sys.platform != 'win32':
+        return False
+    status = _SYSTEM_POWER_STATUS()
+    if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+        return False
+    return status.ACLineStatus == 0 or status.SystemStatusFlag == 1
+
+
+class RefreshScheduler:
+    """Refreshes due accounts one by one from the Tk event loop.
+
+    on_refreshed(account, rank_info) runs on the Tk thread for every result
+    and is expected to apply and save it.
+    """
+
+    def __init__(self, root, manager, on_refreshed, interval=DEFAULT_TICK_INTERVAL, path=None):
+        self.root = root
+        self.manager = manager
+        self.on_refreshed = on_refreshed
+        self.interval = interval
+        self.path = path or get_scheduler_file()
+        self.enabled = True
+        self.failures = 0
+        self.refreshed = 0
+        # 'region:account_id' -> time.time() of the last failed attempt
+        self.attempts = {}
+        self.next_run = 0.0
+        self._after_id = None
+        self._pending = None
+        self.load()
+
+    @staticmethod
+    def _key(acc):
+        return f'{acc.region}:{acc.account_id}'
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SCHEDULER_VERSION:
+                return
+            self.enabled = bool(data.get('enabled', True))
+            self.failures = int(data.get('failures', 0))
+            self.attempts = {str(k): float(v) for k, v in data.get('attempts', {}).items()}
+            self.next_run = float(data.get('next_run', 0.0))
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+
+    def save(self):
+        now = time.time()
+        self.attempts = {k: t for k, t in self.attempts.items() if now - t < RETRY_AFTER}
+        data = {'version': SCHEDULER_VERSION, 'enabled': self.enabled, 'failures': self.failures,
+                'attempts': self.attempts, 'next_run': self.next_run}
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save refresh schedule: {e}")
+
+    def current_interval(self):
+        """Seconds until the next background fetch, after failure, battery and metered backoff."""
+        delay = self.interval
+        if self.failures:
+            delay = min(MAX_BACKOFF, delay * 2 ** min(self.failures, 10))
+        if on_battery():
+            delay *= BATTERY_FACTOR
+        if on_metered_connection():
+            delay *= METERED_FACTOR
+        return delay
+
+    def next_due(self, now=None):
+        """(account, seconds overdue) of the most overdue account, or (None, seconds until one is due)."""
+        now = time.time() if now is None else now
+        best, best_overdue = None, None
+        for acc in self.manager.accounts:
+            if now - self.attempts.get(self._key(acc), 0.0) < RETRY_AFTER:
+                continue
+            overdue = now - acc.last_fetched - self.manager.refresh_ttl(acc)
+            if best_overdue is None or overdue > best_overdue:
+                best, best_overdue = acc, overdue
+        if best is None:
+            return None, MAX_IDLE_DELAY
+        if best_overdue < 0:
+            return None, -best_overdue
+        return best, best_overdue
+
+    def start(self):
+        delay = max(STARTUP_DELAY, min(self.next_run - time.time(), self.current_interval()))
+        self._schedule(delay)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        self.save()
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.save()
+
+    def _schedule(self, delay):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self.next_run = time.time() + delay
+        self._after_id = self.root.after(int(delay * 1000), self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        if not self.enabled or self._pending is not None:
+            self._schedule(self.current_interval())
+            return
+        acc, seconds = self.next_due()
+        if acc is None:
+            # Nothing is due: sleep until something is, checking in now and then
+            self._schedule(min(MAX_IDLE_DELAY, max(self.current_interval(), seconds)))
+            return
+
+        def on_fetched(acc, rank_info):
+            self.root.after(0, lambda: self._on_result(acc, rank_info))
+
+        self._pending = self.manager.fetch_service.submit(acc, callback=on_fetched,
+                                                          priority=PRIORITY_BACKGROUND)
+        self._schedule(self.current_interval())
+
+    def _on_result(self, acc, rank_info):
+        self._pending = None
+        kind = rank_info.get('error')
+        if kind:
+            self.attempts[self._key(acc)] = time.time()
+            if kind in BACKOFF_ERRORS:
+                self.failures += 1
+                # Slow down from now on, not only after the tick already scheduled
+                self._schedule(self.current_interval())
+        else:
+            self.failures = 0
+            self.attempts.pop(self._key(acc), None)
+            self.refreshed += 1
+        try:
+            self.on_refreshed(acc, rank_info)
+        finally:
+            self.save()
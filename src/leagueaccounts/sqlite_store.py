@@ -0,0 +1,166 @@
+"""
+SQLite account store.
+An alternative to the JSON snapshot and journal for very large rosters:
+a change updates only its own row, and search, rank filters and stale
+account selection run as indexed queries instead of scans over the
+whole roster. Each account is kept whole as JSON in the data column;
+the other columns copy the fields that are queried.
+
+Select it with LEAGUEACCOUNTS_STORE=sqlite (see persistence.open_store).
+The first time it opens on an empty database it imports the JSON roster
+and journal, which are left in place as a backup.
+"""
+import json
+import sqlite3
+import threading
+
+from .utils import rank_score, tier_score_range
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    region TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    rank_score INTEGER NOT NULL DEFAULT 0,
+    last_fetched REAL NOT NULL DEFAULT 0,
+    unchanged_fetches INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    PRIMARY KEY (region, account_id)
+);
+CREATE INDEX IF NOT EXISTS accounts_rank ON accounts (rank_score);
+CREATE INDEX IF NOT EXISTS accounts_last_fetched ON accounts (last_fetched);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+UPSERT = """
+INSERT OR REPLACE INTO accounts
+    (region, account_id, name, rank_score, last_fetched, unchanged_fetches, data)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _row(record):
+    """Column values for an account record."""
+    def number(value, cast):
+        try:
+            return cast(value or 0)
+        except (TypeError, ValueError):
+            return cast(0)
+    return (record.get('region', ''), record.get('account_id', ''), record.get('name', ''),
+            rank_score(record.get('tier', 'Unranked'), record.get('division', ''), record.get('lp', '')),
+            number(record.get('last_fetched'), float), number(record.get('unchanged_fetches'), int),
+            json.dumps(record, separators=(',', ':')))
+
+
+class SqliteAccountStore:
+    def __init__(self, path):
+        self.path = path
+        # The write-behind writer calls in from its own thread
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            # Sync the log on every commit, like the JSON stores' fsync
+            self._conn.execute('PRAGMA synchronous=FULL')
+            version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(f"{path} was written by a newer version (schema {version})")
+            with self._conn:
+                self._conn.executescript(SCHEMA)
+                self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def _records(self, sql, params=()):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def load(self):
+        """Return every account dict, best rank first."""
+        return self._records('SELECT data FROM accounts ORDER BY rank_score DESC')
+
+    def save(self, records):
+        """Replace the whole roster in one transaction."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM accounts')
+            self._conn.executemany(UPSERT, (_row(r) for r in records))
+
+    def write(self, changes, snapshot):
+        """Apply a batch of changes in one transaction; snapshot is not needed."""
+        with self._lock, self._conn:
+            for change in changes:
+                region, account_id = change['key']
+                if change['op'] == 'add':
+                    self._conn.execute(UPSERT, _row(change['fields']))
+                elif change['op'] == 'set':
+                    row = self._conn.execute('SELECT data FROM accounts WHERE region = ? AND account_id = ?',
+                                             (region, account_id)).fetchone()
+                    if row is not None:
+                        self._conn.execute(UPSERT, _row({**json.loads(row[0]), **change['fields']}))
+                elif change['op'] == 'del':
+                    self._conn.execute('DELETE FROM accounts WHERE region = ? AND account_id = ?',
+                                       (region, account_id))
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM accounts').fetchone()[0]
+
+    def get(self, region, account_id):
+        records = self._records('SELECT data FROM accounts WHERE region = ? AND account_id = ?',
+                                (region, account_id))
+        return records[0] if records else None
+
+    def search(self, text, limit=None):
+        """Accounts whose name or ID contains text (case-insensitive), best rank first."""
+        pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return self._records("SELECT data FROM accounts WHERE name LIKE ?1 ESCAPE '\\' "
+                             "OR account_id LIKE ?1 ESCAPE '\\' ORDER BY rank_score DESC LIMIT ?2",
+                             (pattern, -1 if limit is None else limit))
+
+    def by_rank(self, lowest=None, highest=None, limit=None):
+        """Accounts ranked from tier lowest up to tier highest (e.g. 'Gold', 'Diamond'), best first."""
+        low = tier_score_range(lowest)[0] if lowest else -2 ** 62
+        high = tier_score_range(highest)[1] if highest else 2 ** 62
+        return self._records('SELECT data FROM accounts WHERE rank_score BETWEEN ? AND ? '
+                             'ORDER BY rank_score DESC LIMIT ?',
+                             (low, high, -1 if limit is None else limit))
+
+    def stale(self, now, min_ttl, max_ttl, limit=None):
+        """Accounts past their refresh TTL (see AccountManager.refresh_ttl), oldest fetch first."""
+        # Nothing fetched within min_ttl can be stale, which the last_fetched index narrows down
+        return self._records('SELECT data FROM accounts WHERE last_fetched <= ?1 - ?2 '
+                             'AND last_fetched + MIN(?3, ?2 * (1 << MIN(unchanged_fetches, 16))) <= ?1 '
+                             'ORDER BY last_fetched LIMIT ?4',
+                             (now, min_ttl, max_ttl, -1 if limit is None else limit))
+
+    def meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row is not None else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def migrate_from(self, json_store):
+        """Import a JSON store's roster once, if this database has never held one.
+
+        Returns the number of accounts imported.
+        """
+        if self.meta('migrated_from') is not None or self.count():
+            return 0
+        records = json_store.load()
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM accounts')
+            self._conn.executemany(UPSERT, (_row(r) for r in records))
+            self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                               ('migrated_from', json_store.path))
+        return len(records)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,4 +1,6 @@
 import os
+import re
+import time
 
 REGION_MAP = {
     'EUW': 'euw',
@@ -38,9 +40,54 @@ def rank_sort_key(tier, division, lp):
         lp_val = 0
     return (tier_idx, division_idx, -lp_val)
 
-def get_accounts_file():
+def rank_score(tier, division, lp):
+    # rank_sort_key folded into one integer, higher is better, for indexing in a database
+    tier_idx, division_idx, neg_lp = rank_sort_key(tier, division, lp)
+    return -(tier_idx * 100000 + division_idx * 10000) + min(max(-neg_lp, 0), 9999)
+
+def tier_score_range(tier):
+    # (lowest, highest) rank_score within a tier
+    tier_idx, _, _ = rank_sort_key(tier, '', 0)
+    return -tier_idx * 100000 - len(DIVISION_ORDER) * 10000, -tier_idx * 100000 + 9999
+
+def format_summoner_name(name):
+    # 'Name Here#TAG' -> 'Name+Here-TAG', as used in summoner page URLs
+    return name.replace('#', '-').replace(' ', '+').replace("--", "-")
+
+def get_app_dir():
     # Always use APPDATA directory
     appdata = os.environ.get('APPDATA') or os.path.expanduser('~')
     folder = os.path.join(appdata, 'LeagueAccounts')
     os.makedirs(folder, exist_ok=True)
-    return os.path.join(folder, 'league_accounts.json') 
\ No newline at end of file
+    return folder
+
+def get_accounts_file():
+    return os.path.join(get_app_dir(), 'league_accounts.json')
+
+def get_accounts_db_file():
+    return os.path.join(get_app_dir(), 'league_accounts.db')
+
+def get_credentials_file():
+    # Plain-text passwords for the development 'file' credential backend
+    return os.path.join(get_app_dir(), 'credentials.dev.json')
+
+def get_response_cache_file():
+    return os.path.join(get_app_dir(), 'response_cache.json')
+
+def get_refresh_report_file():
+    return os.path.join(get_app_dir(), 'refresh_report.json')
+
+def get_scheduler_file():
+    return os.path.join(get_app_dir(), 'scheduler.json')
+
+def season_sort_key(label):
+    # 'Season 2024 (Split 2)' -> (2024, 2); a whole season sorts after its splits
+    numbers = [int(n) for n in re.findall(r'\d+', label)]
+    year = numbers[0] if numbers else 0
+    split = numbers[1] if len(numbers) > 1 else 99
+    return (year, split, label)
+
+def last_season_label(year=None):
+    # Seasons follow the calendar year, so the last finished one is last year's
+    year = time.localtime().tm_year if year is None else year
+    return f'Season {year - 1}'
@@ -1,14 +1,21 @@
 """
 Direct Windows Credential Manager access via ctypes.
 No third-party dependencies — works in both dev and PyInstaller exe.
+Importable elsewhere so the rest of the package loads, but every call
+needs Windows; see credential_backends for the portable interface.
 """
 import ctypes
 import ctypes.wintypes
+import sys
 
-advapi32 = ctypes.WinDLL('advapi32', use_last_error=True)
+advapi32 = ctypes.WinDLL('advapi32', use_last_error=True) if sys.platform == 'win32' else None
 
 CRED_TYPE_GENERIC = 1
 CRED_PERSIST_LOCAL_MACHINE = 2
+ERROR_NOT_FOUND = 1168
+
+# Services whose simple-name credential has already been moved this session
+_migrated_services = set()
 
 
 class _FILETIME(ctypes.Structure):
@@ -44,19 +51,57 @@ def _target_name(service, username):
     return f'{username}@{service}'
 
 
+def _blob_text(cred):
+    if not cred.CredentialBlobSize:
+        return ''
+    return ctypes.string_at(cred.CredentialBlob, cred.CredentialBlobSize).decode('utf-16-le')
+
+
 def _read_credential(target):
     cred_ptr = ctypes.POINTER(_CREDENTIAL)()
     if not advapi32.CredReadW(target, CRED_TYPE_GENERIC, 0, ctypes.byref(cred_ptr)):
         return None
     try:
-        blob = cred_ptr.contents.CredentialBlob
-        size = cred_ptr.contents.CredentialBlobSize
-        raw = bytes(blob[i] for i in range(size))
-        return raw.decode('utf-16-le'), cred_ptr.contents.UserName
+        return _blob_text(cred_ptr.contents), cred_ptr.contents.UserName
     finally:
         advapi32.CredFree(cred_ptr)
 
 
+def enumerate_credentials(service):
+    """{username: password} of every credential stored for service, in one call.
+
+    CredEnumerateW only filters on a target name prefix and ours end in
+    '@{service}', so all credentials are listed and filtered here.
+    A simple-name credential ('{service}') is included unless its user
+    also has a compound one, which get_password would prefer.
+    """
+    count = ctypes.wintypes.DWORD()
+    creds = ctypes.POINTER(ctypes.POINTER(_CREDENTIAL))()
+    if not advapi32.CredEnumerateW(None, 0, ctypes.byref(count), ctypes.byref(creds)):
+        error = ctypes.get_last_error()
+        if error == ERROR_NOT_FOUND:
+            return {}
+        raise ctypes.WinError(error)
+    found = {}
+    simple = None
+    suffix = _target_name(service, '')
+    try:
+        for i in range(count.value):
+            cred = creds[i].contents
+            target = cred.TargetName or ''
+            if cred.Type != CRED_TYPE_GENERIC:
+                continue
+            if target.endswith(suffix) and cred.UserName:
+                found[cred.UserName] = _blob_text(cred)
+            elif target == service and cred.UserName:
+                simple = cred.UserName, _blob_text(cred)
+    finally:
+        advapi32.CredFree(creds)
+    if simple is not None and simple[0] not in found:
+        found[simple[0]] = simple[1]
+    return found
+
+
 def get_password(service, username):
     # Try compound name first: {username}@{service}
     result = _read_credential(_target_name(service, username))
@@ -84,13 +129,21 @@ def _write_credential(target, username, password):
         raise ctypes.WinError(ctypes.get_last_error())
 
 
-def set_password(service, username, password):
-    # Move any existing simple-name credential to compound name (matches keyring behavior)
+def _migrate_simple_name(service, username):
+    # Move any existing simple-name credential to compound name (matches keyring behavior).
+    # Only keyring writes simple names, so once per service and session is enough
+    if service in _migrated_services:
+        return
     existing = _read_credential(service)
     if existing:
         existing_pw, existing_user = existing
         if existing_user != username:
             _write_credential(_target_name(service, existing_user), existing_user, existing_pw)
+    _migrated_services.add(service)
+
+
+def set_password(service, username, password):
+    _migrate_simple_name(service, username)
     # Always store under compound name
     _write_credential(_target_name(service, username), username, password)
 